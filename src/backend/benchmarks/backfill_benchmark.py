@@ -0,0 +1,73 @@
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from urllib.parse import urlsplit
+from backend.benchmarks import mock_server
+from backend.scraping import crawler, engine, fetch
+from backend.scraping.dead_letters import DeadLetters
+from backend.scraping.metrics import METRICS
+from backend.scraping.weekly_stats import TABLES
+
+
+def main():
+    """
+    Function:
+        End-to-end throughput of a synthetic multi-season backfill against
+        the local mock site, through the real crawler, cache and parser
+
+    Input:
+        None
+
+    Output:
+        None
+    """
+    parser = argparse.ArgumentParser(description='Synthetic backfill against the mock site')
+    parser.add_argument('--seasons', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=0)
+    parser.add_argument('--max-in-flight', type=int, default=crawler.MAX_IN_FLIGHT)
+    parser.add_argument('--rate', type=float, default=1000, help='crawler requests per second to the mock')
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=float, default=None)
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--backoff', type=float, default=fetch.BACKOFF)
+    parser.add_argument('--weeks-in-flight', type=int, default=0, help='0 crawls season by season')
+    parser.add_argument('--recent-first', action='store_true')
+    args = parser.parse_args()
+
+    server, base_url = mock_server.start(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate, rate_limit=args.rate_limit, retry_after=args.retry_after
+    )
+    crawler.configure(
+        base_url=base_url,
+        max_in_flight=args.max_in_flight,
+        rates={urlsplit(base_url).netloc: (args.rate, args.max_in_flight)}
+    )
+
+    seasons = range(2022 - args.seasons, 2022)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        fetch.configure(cache_dir=cache_dir, backoff=args.backoff)
+        dead_letters = DeadLetters('backfill', cache_dir)
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            sink = engine.run(
+                TABLES, seasons, workers=args.workers, dead_letters=dead_letters,
+                weeks_in_flight=args.weeks_in_flight, recent_first=args.recent_first
+            )
+        elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    games = len(sink['scores']) // 2
+    print(METRICS.summary())
+    print(server.site.stats())
+    print(f'{games} games in {elapsed:.1f}s, {games / elapsed:.1f} games/s, {len(dead_letters)} dead-lettered')
+
+
+if __name__ == '__main__':
+    main()
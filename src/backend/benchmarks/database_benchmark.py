@@ -0,0 +1,93 @@
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import pandas as pd
+from backend.benchmarks.load_benchmark import ROWS, stat_frame
+from backend.scraping import database, driver
+
+
+# Runs of each query, the median is reported
+REPEATS = 20
+
+
+def timed(function, repeats=REPEATS):
+    """
+    Function:
+        Median seconds of function over repeats runs
+
+    Input:
+        function: function() -> DataFrame
+        repeats: int
+
+    Output:
+        seconds: float
+        df: DataFrame, result of the last run
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        df = function()
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times), df
+
+
+def main():
+    """
+    Function:
+        Load synthetic player stats into the embedded database and time
+        typical season and team aggregations, against re-reading the CSV
+        and grouping it with pandas
+
+    Input:
+        None
+
+    Output:
+        None
+    """
+    parser = argparse.ArgumentParser(description='Query latency of the embedded database')
+    parser.add_argument('--rows', type=int, default=ROWS, help='rows per table')
+    args = parser.parse_args()
+
+    frames = {table: stat_frame(table, args.rows, seed) for seed, table in enumerate(driver.STAT_FILES)}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'SeniorProject.db')
+        csv = os.path.join(directory, 'rushing.csv')
+        driver.clean_frame('PlayerRushing', frames['PlayerRushing']).to_csv(csv, index=False)
+
+        start = time.perf_counter()
+        database.load(frames, path, incremental=False)
+        print(f'loaded {args.rows * len(frames)} rows in {time.perf_counter() - start:.2f}s')
+
+        queries = {
+            'team totals, every season': (
+                lambda: database.aggregate('PlayerRushing', ['Att', 'Yds', 'TD'], path=path),
+                lambda: pd.read_csv(csv).groupby(['SId', 'TId'])[['Att', 'Yds', 'TD']].sum()
+            ),
+            'team totals, one season': (
+                lambda: database.aggregate('PlayerRushing', ['Att', 'Yds', 'TD'], seasons=['S05'], path=path),
+                lambda: pd.read_csv(csv).query("SId == 'S05'").groupby(['SId', 'TId'])[['Att', 'Yds', 'TD']].sum()
+            ),
+            'one team, every season': (
+                lambda: database.aggregate('PlayerRushing', ['Yds'], by=['SId'], teams=['T07'], path=path),
+                lambda: pd.read_csv(csv).query("TId == 'T07'").groupby('SId')[['Yds']].sum()
+            ),
+            'player careers': (
+                lambda: database.aggregate('PlayerRushing', ['Yds', 'TD'], by=['PId'], path=path),
+                lambda: pd.read_csv(csv).groupby('PId')[['Yds', 'TD']].sum()
+            )
+        }
+
+        print(f"{'query':>26} {'rows':>6} {'database ms':>12} {'csv ms':>8}")
+        for name, (sql, csv_query) in queries.items():
+            seconds, df = timed(sql)
+            csv_seconds, expected = timed(csv_query)
+            if len(df) != len(expected):
+                raise AssertionError(f'{name}: {len(df)} rows from the database, {len(expected)} from the CSV')
+            print(f'{name:>26} {len(df):>6} {seconds * 1e3:>12.2f} {csv_seconds * 1e3:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import random
+import sqlite3
+import time
+import pandas as pd
+from backend.scraping import driver
+
+
+# Player seasons of a 12 season load, one row per player, team and season
+ROWS = 20000
+
+
+def stat_frame(table, rows, seed=0):
+    """
+    Function:
+        Frame shaped like the scraped CSV of table: yards with thousands
+        separators, long plays marked with a t and dashes for no value
+
+    Input:
+        table: str
+        rows: int
+        seed: int
+
+    Output:
+        df: DataFrame
+    """
+    rng = random.Random(seed)
+    df = {}
+    for column, source, chars in driver.COLUMNS[table]:
+        if source in ('SId', 'TId', 'PId'):
+            continue
+        if chars == driver.THOUSANDS:
+            df[source] = [f'{rng.randint(0, 2500):,}' for _ in range(rows)]
+        elif chars == driver.TOUCHDOWN:
+            df[source] = [f'{rng.randint(0, 99)}{rng.choice(["", "t"])}' for _ in range(rows)]
+        else:
+            df[source] = [rng.choice([rng.randint(0, 200), round(rng.uniform(0, 20), 1), '--']) for _ in range(rows)]
+
+    df['SId'] = [f'S{row % 12:02d}' for row in range(rows)]
+    df['TId'] = [f'T{row // 12 % 32:02d}' for row in range(rows)]
+    df['PId'] = [f'P{row // 384:05d}' for row in range(rows)]
+
+    return pd.DataFrame(df)
+
+
+def load_rows(cursor, table, df):
+    """
+    Function:
+        The per-row load being replaced: one tuple built per iterrows row,
+        cleaned value by value, then one executemany
+
+    Input:
+        cursor: cursor
+        table: str
+        df: DataFrame
+
+    Output:
+        None
+    """
+    df = df.replace(driver.MISSING, 0)
+    columns = driver.COLUMNS[table]
+    values = []
+    for index, row in df.iterrows():
+        values.append(tuple(
+            row[source] if chars is None else str(row[source]).replace(chars, '')
+            for column, source, chars in columns
+        ))
+
+    names = ', '.join(f'`{column}`' for column, _, _ in columns)
+    cursor.executemany(
+        f"INSERT INTO {table} ({names}) VALUES ({', '.join(['?'] * len(columns))})", values
+    )
+
+
+def bench(load, frames):
+    """
+    Function:
+        Load every frame into a fresh in-memory SQLite database
+
+    Input:
+        load: function(cursor, table, df)
+        frames: dict(str: DataFrame)
+
+    Output:
+        seconds: float
+        db: sqlite3.Connection
+    """
+    db = sqlite3.connect(':memory:')
+    cursor = db.cursor()
+    driver.create_tables(cursor)
+
+    start = time.perf_counter()
+    for table, df in frames.items():
+        load(cursor, table, df)
+    db.commit()
+
+    return time.perf_counter() - start, db
+
+
+def main():
+    """
+    Function:
+        Rows per second of the per-row and the bulk load of the player stat
+        tables into SQLite, checking both leave the same rows
+
+    Input:
+        None
+
+    Output:
+        None
+    """
+    parser = argparse.ArgumentParser(description='Bulk load throughput of driver.py')
+    parser.add_argument('--rows', type=int, default=ROWS, help='rows per table')
+    parser.add_argument('--chunk-size', type=int, default=driver.CHUNK_SIZE)
+    args = parser.parse_args()
+
+    frames = {table: stat_frame(table, args.rows, seed) for seed, table in enumerate(driver.STAT_FILES)}
+    rows = args.rows * len(frames)
+
+    per_row, expected = bench(load_rows, frames)
+    bulk, db = bench(
+        lambda cursor, table, df: driver.load_table(cursor, table, df, 'sqlite', chunk_size=args.chunk_size),
+        frames
+    )
+
+    for table in frames:
+        query = f'SELECT * FROM {table} ORDER BY SId, TId, PId'
+        if expected.execute(query).fetchall() != db.execute(query).fetchall():
+            raise AssertionError(f'{table} differs between the per-row and the bulk load')
+
+    print(f"{'load':>8} {'rows':>8} {'seconds':>8} {'rows/s':>10}")
+    print(f"{'per-row':>8} {rows:>8} {per_row:>8.2f} {rows / per_row:>10.0f}")
+    print(f"{'bulk':>8} {rows:>8} {bulk:>8.2f} {rows / bulk:>10.0f}")
+    print(f'{per_row / bulk:.1f}x faster, tables identical')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+from backend.benchmarks.parity import load_boxscores
+from backend.scraping.schema import memory_report
+from backend.scraping.sink import TableSink
+from backend.scraping.weekly_stats import parse_game
+
+
+# Saved boxscores are replayed to simulate a season
+GAMES = 270
+
+
+def scrape(boxscores, typed):
+    """
+    Function:
+        Parse a season of pages into text or typed tables
+
+    Input:
+        boxscores: list((bytes, dict))
+        typed: bool
+
+    Output:
+        tables: dict(str: DataFrame)
+    """
+    sink = TableSink(typed=typed)
+    for game in range(GAMES):
+        html, game_info = boxscores[game % len(boxscores)]
+        parse_game(html, game_info, sink)
+
+    return {table: sink[table] for table in sink}
+
+
+def main():
+    boxscores = load_boxscores()
+    report = memory_report(scrape(boxscores, False), scrape(boxscores, True))
+
+    print(report.to_string(formatters={'reduction': '{:.0%}'.format}))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,357 @@
+import argparse
+import datetime
+import gzip
+import hashlib
+import random
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from backend.benchmarks.parity import load_boxscores
+
+
+TEAMS = [
+    'Arizona Cardinals', 'Atlanta Falcons', 'Baltimore Ravens', 'Buffalo Bills',
+    'Carolina Panthers', 'Chicago Bears', 'Cincinnati Bengals', 'Cleveland Browns',
+    'Dallas Cowboys', 'Denver Broncos', 'Detroit Lions', 'Green Bay Packers',
+    'Houston Texans', 'Indianapolis Colts', 'Jacksonville Jaguars', 'Kansas City Chiefs',
+    'Las Vegas Raiders', 'Los Angeles Chargers', 'Los Angeles Rams', 'Miami Dolphins',
+    'Minnesota Vikings', 'New England Patriots', 'New Orleans Saints', 'New York Giants',
+    'New York Jets', 'Philadelphia Eagles', 'Pittsburgh Steelers', 'San Francisco 49ers',
+    'Seattle Seahawks', 'Tampa Bay Buccaneers', 'Tennessee Titans', 'Washington Football Team'
+]
+
+# Regular season weeks, 18 from 2021 on
+WEEKS = 17
+WEEKS_SINCE_2021 = 18
+
+# Seconds over which rate_limit is enforced
+RATE_WINDOW = 10
+
+
+def season_weeks(season):
+    """
+    Function:
+        Regular season weeks of season
+
+    Input:
+        season: int
+
+    Output:
+        weeks: int
+    """
+    return WEEKS_SINCE_2021 if season >= 2021 else WEEKS
+
+
+def week_games(season, week):
+    """
+    Function:
+        Games of a synthetic week: every team plays, pairings rotate each
+        week, kickoffs on the week's Sunday
+
+    Input:
+        season: int
+        week: int
+
+    Output:
+        games: list((str, str, str, str)), date, away, home and boxscore code
+    """
+    sunday = datetime.date(season, 9, 7) + datetime.timedelta(days=7 * (week - 1))
+    sunday += datetime.timedelta(days=(6 - sunday.weekday()) % 7)
+    date = f'{sunday:%b} {sunday.day}, {sunday.year}'
+
+    teams = TEAMS[:1] + TEAMS[1:][week % 31:] + TEAMS[1:][:week % 31]
+    games = []
+    for game in range(len(teams) // 2):
+        away, home = teams[game], teams[-1 - game]
+        games.append((date, away, home, f'{sunday:%Y%m%d}{game:02d}{home[:3].lower()}'))
+
+    return games
+
+
+def season_page(season):
+    """
+    Function:
+        Season page linking every week
+
+    Input:
+        season: int
+
+    Output:
+        html: bytes
+    """
+    links = ''.join(
+        f'<li><a href="/years/{season}/week_{week}.htm">Week {week}</a></li>'
+        for week in range(1, season_weeks(season) + 1)
+    )
+
+    return (
+        f'<html><head><title>{season} NFL Standings</title></head><body>'
+        f'<div id="div_week"><ul>{links}</ul></div>'
+        f'<a href="/years/{season - 1}/">{season - 1} Season</a></body></html>'
+    ).encode('utf-8')
+
+
+def week_page(season, week):
+    """
+    Function:
+        Week page listing every game of week with its boxscore link
+
+    Input:
+        season: int
+        week: int
+
+    Output:
+        html: bytes
+    """
+    rng = random.Random(season * 100 + week)
+    summaries = []
+    for date, away, home, code in week_games(season, week):
+        away_points, home_points = rng.randint(0, 45), rng.randint(0, 45)
+        summaries.append(
+            '<div class="game_summary expanded nohover"><table class="teams"><tbody>'
+            f'<tr class="date"><td colspan="3">{date}</td></tr>'
+            f'<tr class="loser"><td><a href="/teams/x/{season}.htm">{away}</a></td>'
+            f'<td class="right">{away_points}</td><td class="right gamelink">'
+            f'<a href="/boxscores/{code}.htm">Final</a></td></tr>'
+            f'<tr class="winner"><td><a href="/teams/y/{season}.htm">{home}</a></td>'
+            f'<td class="right">{home_points}</td><td class="right"></td></tr>'
+            '</tbody></table></div>'
+        )
+
+    return (
+        f'<html><head><title>{season} Week {week}</title></head><body>'
+        f'<div class="game_summaries">{"".join(summaries)}</div></body></html>'
+    ).encode('utf-8')
+
+
+class MockSite:
+    """
+    Class:
+        Pages and fault injection of the mock site. Season and week pages
+        are generated for any season, boxscores are the saved fixture pages
+        picked by a hash of the path. Responses are delayed by latency plus
+        up to jitter seconds, a share of them fail with 503 or 429, and
+        requests over rate_limit per second are refused with 429.
+
+    Input:
+        latency: float
+        jitter: float
+        error_rate: float
+        throttle_rate: float
+        rate_limit: float, None for no limit
+        retry_after: int, seconds sent with every 429
+        seed: int
+    """
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0, rate_limit=None,
+                 retry_after=1, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.boxscores = [html for html, _ in load_boxscores()]
+        self.recent = deque()
+        self.statuses = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def page(self, path):
+        """
+        Function:
+            Body of page at path
+
+        Input:
+            path: str
+
+        Output:
+            html: bytes, None when there is no such page
+        """
+        parts = path.strip('/').split('/')
+        if len(parts) in (2, 3) and parts[0] == 'years' and parts[1].isdigit():
+            season = int(parts[1])
+            if len(parts) == 2:
+                return season_page(season)
+            if parts[2].startswith('week_') and parts[2].endswith('.htm'):
+                week = parts[2][len('week_'):-len('.htm')]
+                if week.isdigit() and 1 <= int(week) <= season_weeks(season):
+                    return week_page(season, int(week))
+        if len(parts) == 2 and parts[0] == 'boxscores' and parts[1].endswith('.htm'):
+            return self.boxscores[zlib.crc32(path.encode('utf-8')) % len(self.boxscores)]
+
+        return None
+
+    def fault(self):
+        """
+        Function:
+            Injected failure status of the next response
+
+        Input:
+            None
+
+        Output:
+            status: int, None to serve the page
+        """
+        with self.lock:
+            now = time.monotonic()
+            if self.rate_limit is not None:
+                while self.recent and now - self.recent[0] > RATE_WINDOW:
+                    self.recent.popleft()
+                if len(self.recent) >= self.rate_limit * RATE_WINDOW:
+                    return 429
+                self.recent.append(now)
+
+            draw = self.rng.random()
+            if draw < self.throttle_rate:
+                return 429
+            if draw < self.throttle_rate + self.error_rate:
+                return 503
+
+        return None
+
+    def respond(self, handler):
+        """
+        Function:
+            Answer GET request of handler
+
+        Input:
+            handler: BaseHTTPRequestHandler
+
+        Output:
+            None
+        """
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+        try:
+            time.sleep(delay)
+
+            headers = {}
+            status = self.fault()
+            html = self.page(urlsplit(handler.path).path) if status is None else None
+            if status == 429:
+                headers['Retry-After'] = str(self.retry_after)
+            elif status is None and html is None:
+                status = 404
+            elif status is None:
+                etag = f'"{hashlib.sha1(html).hexdigest()}"'
+                headers['ETag'] = etag
+                if handler.headers.get('If-None-Match') == etag:
+                    status, html = 304, None
+                else:
+                    status = 200
+                    if 'gzip' in handler.headers.get('Accept-Encoding', ''):
+                        html = gzip.compress(html)
+                        headers['Content-Encoding'] = 'gzip'
+
+            # Counted before the client can read the response
+            with self.lock:
+                self.statuses[status] += 1
+
+            body = html or b''
+            handler.send_response(status)
+            for name, value in headers.items():
+                handler.send_header(name, value)
+            handler.send_header('Content-Type', 'text/html; charset=utf-8')
+            handler.send_header('Content-Length', str(len(body)))
+            handler.end_headers()
+            handler.wfile.write(body)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def stats(self):
+        """
+        Function:
+            Responses served by status and the most served at once
+
+        Input:
+            None
+
+        Output:
+            stats: dict
+        """
+        with self.lock:
+            return {'statuses': dict(self.statuses), 'max_in_flight': self.max_in_flight}
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """
+    Class:
+        Keep-alive request handler answering from the server's MockSite
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.site.respond(self)
+
+    def log_message(self, *args):
+        pass
+
+
+def start(host='127.0.0.1', port=0, **options):
+    """
+    Function:
+        Serve the mock site from a background thread
+
+    Input:
+        host: str
+        port: int, 0 picks a free port
+        options: MockSite options
+
+    Output:
+        server: ThreadingHTTPServer, stop with server.shutdown()
+        base_url: str
+    """
+    server = ThreadingHTTPServer((host, port), MockHandler)
+    server.daemon_threads = True
+    server.site = MockSite(**options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server, f'http://{host}:{server.server_address[1]}'
+
+
+def main():
+    """
+    Function:
+        Serve the mock site until interrupted. Point the scrapers at it
+        with SCRAPE_BASE_URL.
+
+    Input:
+        None
+
+    Output:
+        None
+    """
+    parser = argparse.ArgumentParser(description='Local stand-in for pro-football-reference.com')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='up to this many more seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of 503 responses')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='share of 429 responses')
+    parser.add_argument('--rate-limit', type=float, default=None, help='requests per second before 429s')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds of 429s')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), MockHandler)
+    server.daemon_threads = True
+    server.site = MockSite(
+        args.latency, args.jitter, args.error_rate, args.throttle_rate, args.rate_limit, args.retry_after, args.seed
+    )
+    print(f'Serving on http://{args.host}:{args.port}, SCRAPE_BASE_URL=http://{args.host}:{args.port}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(server.site.stats())
+
+
+if __name__ == '__main__':
+    main()
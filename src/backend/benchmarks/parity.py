@@ -0,0 +1,103 @@
+import json
+import os
+import sys
+from backend.scraping.schema import to_text
+from backend.scraping.sink import TableSink
+from backend.scraping.weekly_stats import parse_game
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def load_boxscores():
+    """
+    Function:
+        Saved boxscore pages and their game info
+
+    Input:
+        None
+
+    Output:
+        boxscores: list((bytes, dict))
+    """
+    with open(os.path.join(FIXTURES_DIR, 'boxscores', 'games.json')) as f:
+        games = json.load(f)
+
+    boxscores = []
+    for game in games:
+        with open(os.path.join(FIXTURES_DIR, 'boxscores', game['file']), 'rb') as f:
+            boxscores.append((f.read(), game['game_info']))
+
+    return boxscores
+
+
+def scrape_fixtures(typed=False):
+    """
+    Function:
+        Parse every saved boxscore into CSV text per table, as the
+        engine writes it
+
+    Input:
+        typed: bool, parse into a typed sink like engine.run does
+
+    Output:
+        csvs: dict(str: str)
+    """
+    sink = TableSink(typed=typed)
+    for html, game_info in load_boxscores():
+        parse_game(html, game_info, sink)
+
+    return {table: to_text(table, sink[table]).to_csv(index=False) for table in sink}
+
+
+def read_expected(table):
+    """
+    Function:
+        Expected CSV text of table
+
+    Input:
+        table: str
+
+    Output:
+        text: str
+    """
+    with open(os.path.join(FIXTURES_DIR, 'expected', f'{table}.csv'), newline='') as f:
+        return f.read()
+
+
+def main():
+    """
+    Function:
+        Check boxscore parsing against the expected CSVs, through an
+        untyped and a typed sink. With --update the expected CSVs are
+        rewritten from the untyped sink instead.
+
+    Input:
+        None
+
+    Output:
+        None
+    """
+    csvs = scrape_fixtures()
+    expected_dir = os.path.join(FIXTURES_DIR, 'expected')
+
+    if '--update' in sys.argv:
+        for table, text in csvs.items():
+            with open(os.path.join(expected_dir, f'{table}.csv'), 'w', newline='') as f:
+                f.write(text)
+        return
+
+    failed = []
+    for typed in (False, True):
+        csvs = scrape_fixtures(typed)
+        mismatched = [table for table, text in csvs.items() if read_expected(table) != text]
+        print(f"{'typed' if typed else 'untyped'}: {len(csvs) - len(mismatched)}/{len(csvs)} tables match")
+        failed.extend(f"{table} ({'typed' if typed else 'untyped'})" for table in mismatched)
+
+    if failed:
+        print(f"Mismatched tables: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
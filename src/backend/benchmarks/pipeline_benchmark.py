@@ -0,0 +1,45 @@
+import os
+import time
+from backend.benchmarks.parity import load_boxscores
+from backend.scraping.pipeline import ParsePool
+from backend.scraping.sink import TableSink
+from backend.scraping.weekly_stats import parse_game
+
+
+# Saved boxscores are replayed to simulate a season re-parse
+GAMES = 270
+
+
+def reparse(boxscores, workers):
+    """
+    Function:
+        Games per second parsing a season of pages through the pool
+
+    Input:
+        boxscores: list((bytes, dict))
+        workers: int
+
+    Output:
+        rate: float
+    """
+    sink = TableSink()
+    start = time.perf_counter()
+    with ParsePool(parse_game, sink, workers) as pool:
+        for game in range(GAMES):
+            html, game_info = boxscores[game % len(boxscores)]
+            pool.submit(html, game_info)
+
+    return GAMES / (time.perf_counter() - start)
+
+
+def main():
+    boxscores = load_boxscores()
+
+    workers = 1
+    while workers <= os.cpu_count():
+        print(f'{workers:>3} workers {reparse(boxscores, workers):>8.0f} games/s')
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
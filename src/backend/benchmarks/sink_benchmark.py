@@ -0,0 +1,97 @@
+import time
+import pandas as pd
+from backend.scraping.sink import TableSink
+
+
+# Games in a 12 season backfill and rows one game adds to player_offense
+GAMES = 3200
+ROWS_PER_GAME = 24
+CHECKPOINT = 400
+
+
+def game_rows(game):
+    """
+    Function:
+        Columns of one game shaped like player_offense
+
+    Input:
+        game: int
+
+    Output:
+        df: dict(str: list)
+    """
+    df = {
+        'date': ['Sep 12, 2021'] * ROWS_PER_GAME,
+        'week': ['1'] * ROWS_PER_GAME,
+        'season': [2021] * ROWS_PER_GAME,
+        'team': ['Tampa Bay Buccaneers'] * ROWS_PER_GAME,
+        'opponent': ['Dallas Cowboys'] * ROWS_PER_GAME,
+        'home_field': [False] * ROWS_PER_GAME,
+        'player': [f'Player {game}-{i}' for i in range(ROWS_PER_GAME)]
+    }
+    for stat in ['pass_cmp', 'pass_att', 'pass_yds', 'pass_td', 'rush_att', 'rush_yds', 'rec', 'rec_yds']:
+        df[stat] = [str(i) for i in range(ROWS_PER_GAME)]
+
+    return df
+
+
+def bench_concat():
+    """
+    Function:
+        Per game cost of growing one DataFrame, the old DataFrame.append pattern
+
+    Input:
+        None
+
+    Output:
+        costs: list(float)
+    """
+    df = pd.DataFrame()
+    costs = []
+    start = time.perf_counter()
+    for game in range(1, GAMES + 1):
+        df = pd.concat([df, pd.DataFrame(game_rows(game))], ignore_index=True)
+        if game % CHECKPOINT == 0:
+            costs.append((time.perf_counter() - start) / CHECKPOINT)
+            start = time.perf_counter()
+
+    return costs
+
+
+def bench_sink():
+    """
+    Function:
+        Per game cost of buffering rows in a TableSink, including the final build
+
+    Input:
+        None
+
+    Output:
+        costs: list(float)
+    """
+    sink = TableSink(['player_offense'])
+    costs = []
+    start = time.perf_counter()
+    for game in range(1, GAMES + 1):
+        sink.append('player_offense', game_rows(game))
+        if game == GAMES:
+            sink.frame('player_offense')
+        if game % CHECKPOINT == 0:
+            costs.append((time.perf_counter() - start) / CHECKPOINT)
+            start = time.perf_counter()
+
+    return costs
+
+
+def main():
+    concat = bench_concat()
+    sink = bench_sink()
+
+    print(f"{'games':>8} {'rows':>8} {'concat us/game':>16} {'sink us/game':>14}")
+    for i, (a, b) in enumerate(zip(concat, sink)):
+        games = (i + 1) * CHECKPOINT
+        print(f'{games:>8} {games * ROWS_PER_GAME:>8} {a * 1e6:>16.0f} {b * 1e6:>14.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,308 @@
+import json
+import os
+import sys
+import time
+import tracemalloc
+from backend.benchmarks.parity import FIXTURES_DIR, load_boxscores
+from backend.scraping import engine, schedule
+from backend.scraping.crawler import week_number
+from backend.scraping.extractors import EXTRACTORS
+from backend.scraping.sink import TableSink
+from backend.scraping.tables import find_tables
+from backend.scraping.weekly_stats import TABLES, parse_game
+
+
+# Stored results the suite is compared against
+BASELINE_PATH = os.path.join(FIXTURES_DIR, 'baseline.json')
+
+# Slowdown, or memory growth, over the baseline reported as a regression
+TOLERANCE = 0.25
+
+# Timed rounds per benchmark, the best one is kept
+ROUNDS = 5
+
+# Passes over the saved boxscores per round
+REPEAT = 20
+
+# Simulated season: weeks of games replayed from the saved pages
+WEEKS = 17
+GAMES_PER_WEEK = 16
+
+
+def load_page(*path):
+    """
+    Function:
+        Saved page
+
+    Input:
+        path: str, path under FIXTURES_DIR
+
+    Output:
+        html: bytes
+    """
+    with open(os.path.join(FIXTURES_DIR, *path), 'rb') as f:
+        return f.read()
+
+
+def best_rate(function, calls):
+    """
+    Function:
+        Calls per second of the fastest of ROUNDS runs of function, and
+        runs per second of the fastest calibration timed between them
+
+    Input:
+        function: function(), makes calls calls per run
+        calls: int
+
+    Output:
+        rate: float
+        speed: float
+    """
+    best = fastest = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        calibration()
+        fastest = min(fastest, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return calls / best, 1 / fastest
+
+
+def calibration():
+    """
+    Function:
+        Fixed workload that does not change with the scraper. It is timed
+        next to every benchmark, to scale the baseline to the speed of the
+        machine at that moment.
+
+    Input:
+        None
+
+    Output:
+        None
+    """
+    for i in range(20000):
+        str(i).zfill(8)
+
+
+def bench_pages(season_html, week_html):
+    """
+    Function:
+        Pages per second parsing the season and week pages
+
+    Input:
+        season_html: bytes
+        week_html: bytes
+
+    Output:
+        results: dict(str: (float, float, str)), value, speed and unit
+    """
+    def season():
+        for _ in range(REPEAT):
+            engine.parse_season(season_html)
+
+    def week():
+        for _ in range(REPEAT):
+            engine.parse_week(week_html, '1', 2021)
+
+    def schedule_week():
+        for _ in range(REPEAT):
+            schedule.parse_week(week_html, '1', 2021)
+
+    return {
+        'parse_season': (*best_rate(season, REPEAT), 'pages/s'),
+        'parse_week': (*best_rate(week, REPEAT), 'pages/s'),
+        'schedule.parse_week': (*best_rate(schedule_week, REPEAT), 'pages/s')
+    }
+
+
+def bench_games(boxscores):
+    """
+    Function:
+        Games per second of the whole boxscore parse, of indexing the
+        page's tables and of every table function on the indexed tables
+
+    Input:
+        boxscores: list((bytes, dict))
+
+    Output:
+        results: dict(str: (float, float, str)), value, speed and unit
+    """
+    calls = REPEAT * len(boxscores)
+    elements = engine.boxscore_elements(engine.OUTPUTS)
+
+    def whole():
+        sink = TableSink(typed=True)
+        for _ in range(REPEAT):
+            for html, game_info in boxscores:
+                parse_game(html, game_info, sink)
+
+    def index():
+        for _ in range(REPEAT):
+            for html, _ in boxscores:
+                find_tables(html, elements)
+
+    results = {
+        'parse_game': (*best_rate(whole, calls), 'games/s'),
+        'find_tables': (*best_rate(index, calls), 'games/s')
+    }
+
+    indexed = [(find_tables(html, elements), game_info) for html, game_info in boxscores]
+    for extractor, names in EXTRACTORS.values():
+        def table():
+            sink = TableSink()
+            for _ in range(REPEAT):
+                for tables, game_info in indexed:
+                    extractor(*[tables.get(name) for name in names], game_info, sink)
+
+        results[extractor.__name__] = (*best_rate(table, calls), 'games/s')
+
+    return results
+
+
+def simulate_season(season_html, week_html, boxscores):
+    """
+    Function:
+        Scrape a simulated season from the saved pages: the season page,
+        WEEKS week pages and GAMES_PER_WEEK boxscores per week, replayed
+        into a typed sink, ending with the finished tables
+
+    Input:
+        season_html: bytes
+        week_html: bytes
+        boxscores: list((bytes, dict))
+
+    Output:
+        tables: dict(str: DataFrame)
+    """
+    sink = TableSink(TABLES, typed=True)
+    games = 0
+    for href in engine.parse_season(season_html)[:WEEKS]:
+        engine.parse_week(week_html, week_number(href), 2021)
+        for _ in range(GAMES_PER_WEEK):
+            html, game_info = boxscores[games % len(boxscores)]
+            parse_game(html, game_info, sink)
+            games += 1
+
+    return {table: sink[table] for table in sink}
+
+
+def bench_season(season_html, week_html, boxscores):
+    """
+    Function:
+        Games per second and peak traced memory of a simulated season.
+        Memory is traced in a run of its own, tracing slows the parse.
+
+    Input:
+        season_html: bytes
+        week_html: bytes
+        boxscores: list((bytes, dict))
+
+    Output:
+        results: dict(str: (float, float, str)), value, speed and unit
+    """
+    def season():
+        simulate_season(season_html, week_html, boxscores)
+
+    rate, speed = best_rate(season, WEEKS * GAMES_PER_WEEK)
+
+    tracemalloc.start()
+    simulate_season(season_html, week_html, boxscores)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'season': (rate, speed, 'games/s'),
+        'season_peak_memory': (peak / 2 ** 20, None, 'MB')
+    }
+
+
+def compare(results, baseline):
+    """
+    Function:
+        Table of results next to the baseline, flagging regressions beyond
+        TOLERANCE. Rates regress when lower, memory when higher. Baseline
+        rates are scaled by how much faster the machine ran the calibration
+        than when they were stored.
+
+    Input:
+        results: dict(str: (float, float, str)), value, speed and unit
+        baseline: dict(str: dict)
+
+    Output:
+        lines: list(str)
+        regressions: list(str)
+    """
+    lines = [f"{'benchmark':<32}{'baseline':>12}{'current':>12}  {'unit':<8}{'change':>8}"]
+    regressions = []
+    for name, (value, speed, unit) in results.items():
+        stored = baseline.get(name)
+        if stored is None:
+            lines.append(f"{name:<32}{'-':>12}{value:>12.1f}  {unit:<8}{'new':>8}")
+            continue
+
+        expected = stored['value'] if speed is None else stored['value'] * speed / stored['speed']
+        change = value / expected - 1
+        worse = change > TOLERANCE if speed is None else change < -TOLERANCE
+        if worse:
+            regressions.append(name)
+        lines.append(
+            f"{name:<32}{expected:>12.1f}{value:>12.1f}  {unit:<8}{change:>+8.0%}"
+            f"{'  REGRESSION' if worse else ''}"
+        )
+
+    return lines, regressions
+
+
+def main():
+    """
+    Function:
+        Run the benchmarks on the saved pages and compare them against
+        the stored baseline, exiting with an error on a regression. With
+        --update the baseline is rewritten instead.
+
+    Input:
+        None
+
+    Output:
+        None
+    """
+    season_html = load_page('seasons', '2021.htm')
+    week_html = load_page('weeks', '2021_week_1.htm')
+    boxscores = load_boxscores()
+
+    results = {
+        **bench_pages(season_html, week_html),
+        **bench_games(boxscores),
+        **bench_season(season_html, week_html, boxscores)
+    }
+
+    if '--update' in sys.argv:
+        with open(BASELINE_PATH, 'w') as f:
+            baseline = {
+                name: {'value': round(value, 1), 'speed': speed and round(speed, 1), 'unit': unit}
+                for name, (value, speed, unit) in results.items()
+            }
+            json.dump(baseline, f, indent=4)
+            f.write('\n')
+        print(f'Baseline written to {BASELINE_PATH}')
+        return
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    lines, regressions = compare(results, baseline)
+    print('\n'.join(lines))
+
+    if regressions:
+        print(f"Regressed beyond {TOLERANCE:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+import time
+from backend.benchmarks.parity import load_boxscores
+from backend.scraping.sink import TableSink
+from backend.scraping.tables import find_tables
+from backend.scraping.extractors import scrape_home_away_tag, scrape_scores, scrape_tag, scrape_team_stats
+from backend.scraping.weekly_stats import parse_game
+
+
+# Passes over the saved boxscores per measurement
+REPEAT = 50
+
+
+def count_cells(table):
+    """
+    Function:
+        Body cells of table
+
+    Input:
+        table: element
+
+    Output:
+        cells: int
+    """
+    return sum(1 for _ in table.find('tbody').iter('th', 'td'))
+
+
+def measure(name, function, boxscores, cells):
+    """
+    Function:
+        Print calls and cells per second of function over boxscores
+
+    Input:
+        name: str
+        function: function(tables, game_info)
+        boxscores: list((dict, dict))
+        cells: int
+
+    Output:
+        None
+    """
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for tables, game_info in boxscores:
+            function(tables, game_info)
+    elapsed = time.perf_counter() - start
+
+    calls = REPEAT * len(boxscores)
+    print(f'{name:<22} {calls / elapsed:>10.0f} calls/s {REPEAT * cells / elapsed:>12.0f} cells/s')
+
+
+def main():
+    pages = load_boxscores()
+    boxscores = [(find_tables(html), game_info) for html, game_info in pages]
+
+    def cells(*names):
+        return sum(count_cells(tables[name]) for tables, _ in boxscores for name in names)
+
+    sink = TableSink()
+    measure(
+        'scrape_scores',
+        lambda tables, game_info: scrape_scores(tables['linescore'], tables['scoring'], game_info, sink),
+        boxscores, cells('linescore', 'scoring')
+    )
+    measure(
+        'scrape_team_stats',
+        lambda tables, game_info: scrape_team_stats(tables['team_stats'], game_info, sink),
+        boxscores, cells('team_stats')
+    )
+    measure(
+        'scrape_tag',
+        lambda tables, game_info: scrape_tag(tables['player_offense'], game_info),
+        boxscores, cells('player_offense')
+    )
+    measure(
+        'scrape_home_away_tag',
+        lambda tables, game_info: scrape_home_away_tag(tables['home_drives'], game_info, 'home', drives=True),
+        boxscores, cells('home_drives')
+    )
+
+    # Whole boxscore, page parse included
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for html, game_info in pages:
+            parse_game(html, game_info, sink)
+    elapsed = time.perf_counter() - start
+    print(f"{'parse_game':<22} {REPEAT * len(pages) / elapsed:>10.0f} games/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import pandas as pd
+from backend.scraping.store import read_table
+
+
+# Columns that identify a game in the scoring table
+GAME = ['season', 'week', 'away', 'home']
+
+
+def scoring_runs(scoring, straight=(3,)):
+    """
+    Function:
+        Scoring run props of every game at once, from the scoring plays:
+            ~ longest_run: most scores in a row by one team
+            ~ longest_run_team
+            ~ {n}_straight: whether a team scored n times in a row
+            ~ first_scorer, first_score_quarter, first_score_time
+            ~ last_scorer
+
+    Input:
+        scoring: DataFrame, scoring table
+        straight: iterable(int), run lengths to flag
+
+    Output:
+        runs: DataFrame, one row per game indexed by GAME
+    """
+    plays = scoring.sort_values(GAME + ['play'], kind='stable').reset_index(drop=True)
+    keys = plays[GAME]
+
+    # A run starts at every new game or change of scoring team
+    new_game = (keys != keys.shift()).any(axis=1)
+    new_run = new_game | (plays['team'] != plays['team'].shift())
+    run = new_run.cumsum()
+
+    lengths = plays.groupby(run, sort=False).agg(
+        **{key: (key, 'first') for key in GAME},
+        team=('team', 'first'),
+        length=('team', 'size')
+    )
+    longest = lengths.loc[lengths.groupby(GAME, sort=False)['length'].idxmax()].set_index(GAME)
+
+    games = plays.groupby(GAME, sort=False)
+    runs = pd.DataFrame({
+        'longest_run': longest['length'],
+        'longest_run_team': longest['team']
+    })
+    for n in straight:
+        runs[f'{n}_straight'] = runs['longest_run'] >= n
+    runs['first_scorer'] = games['team'].first()
+    runs['first_score_quarter'] = games['quarter'].first()
+    runs['first_score_time'] = games['time'].first()
+    runs['last_scorer'] = games['team'].last()
+
+    return runs
+
+
+def load_runs(seasons=None, straight=(3,)):
+    """
+    Function:
+        Scoring run props of every stored game
+
+    Input:
+        seasons: iterable(int), every season when None
+        straight: iterable(int), run lengths to flag
+
+    Output:
+        runs: DataFrame
+    """
+    scoring = read_table('scoring', GAME + ['play', 'quarter', 'time', 'team'], seasons=seasons)
+
+    return scoring_runs(scoring, straight)
@@ -1,5 +1,7 @@
 import pandas as pd
 import numpy as np
+from backend.modeling.analytics.scoring_runs import load_runs
+from backend.scraping.store import read_table
 
 
 def round_totals(number, base):
@@ -93,12 +95,24 @@ def ui(table, five_years, past_season):
         done = input('If done type: Q   ')
 
 
+def load_three_straight():
+    # Three straight scores of every game, from the scoring plays
+    scores = load_runs(straight=[3]).reset_index()
+    if not scores.empty:
+        return scores[['home', 'away', 'week', 'season', '3_straight']]
+
+    # Stores migrated from CSV files have no scoring plays until a full scrape, use the scores flag
+    scores = read_table('scores', ['season', 'week', 'team', 'opponent', 'home_field', '3_straight'])
+    home_field = scores['home_field'].fillna(False).to_numpy(dtype=bool)
+    scores['home'] = np.where(home_field, scores['team'], scores['opponent'])
+    scores['away'] = np.where(home_field, scores['opponent'], scores['team'])
+
+    return scores[['home', 'away', 'week', 'season', '3_straight']].drop_duplicates(['home', 'away', 'week', 'season'])
+
+
 def pivot_table():
     # Load data
-    scores = pd.read_csv('backend/data/games/scores.csv')
-    scores['home'] = np.where(scores['home_field'], scores['team'], scores['opponent'])
-    scores['away'] = np.where(scores['home_field'], scores['opponent'], scores['team'])
-    scores = scores[['home', 'away', 'week', 'season', '3_straight']].drop_duplicates(['home', 'away', 'week', 'season'])
+    scores = load_three_straight()
     scores.set_index(['home', 'away', 'week', 'season'], inplace=True)
     odds = pd.read_csv('backend/data/odds/odds.csv')
     odds.set_index(['home', 'away', 'week', 'season'], inplace=True)
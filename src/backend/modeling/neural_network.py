@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from backend.scraping.store import read_table
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
@@ -28,8 +29,7 @@ def load_odds():
     odds.set_index(['home', 'away', 'week', 'season'], inplace=True, drop=True)
     
     # Load scores to merge date
-    scores = pd.read_csv('backend/data/games/scores.csv')
-    scores['date'] = pd.to_datetime(scores['date'])
+    scores = read_table('scores', ['date', 'week', 'season', 'team', 'opponent', 'home_field'])
     scores['home'] = np.where(scores['home_field'], scores['team'], scores['opponent'])
     scores['away'] = np.where(scores['home_field'], scores['opponent'], scores['team'])
     scores.set_index(['home', 'away', 'week', 'season'], inplace=True, drop=True)
@@ -0,0 +1,194 @@
+import asyncio
+import time
+from collections import deque
+from backend.scraping.crawler import Crawler, page_url, retry_dead_letters, week_number
+from backend.scraping.fetch import FETCH_ERRORS
+from backend.scraping.metrics import METRICS
+
+
+# Weeks fetched ahead of the one being parsed
+WEEKS_IN_FLIGHT = 4
+
+
+class Progress:
+    """
+    Class:
+        Progress of a backfill in weeks and games, with the rate so far and
+        the time left at that rate
+
+    Input:
+        weeks: int, weeks scheduled
+    """
+    def __init__(self, weeks):
+        self.weeks = weeks
+        self.weeks_done = 0
+        self.games = 0
+        self.start = time.monotonic()
+
+    def eta(self):
+        """
+        Function:
+            Seconds left at the rate of the weeks done so far
+
+        Input:
+            None
+
+        Output:
+            seconds: float, None before the first week is done
+        """
+        if not self.weeks_done:
+            return None
+
+        return (time.monotonic() - self.start) / self.weeks_done * (self.weeks - self.weeks_done)
+
+    def week_done(self, season, week, games):
+        """
+        Function:
+            Count a finished week and print progress
+
+        Input:
+            season: int
+            week: str
+            games: int
+
+        Output:
+            None
+        """
+        self.weeks_done += 1
+        self.games += games
+        elapsed = time.monotonic() - self.start
+        minutes, seconds = divmod(int(self.eta()), 60)
+        print(
+            f'{self.weeks_done}/{self.weeks} weeks ({season} week {week}), {self.games} games, '
+            f'{self.games / elapsed:.1f} games/s, ETA {minutes // 60}:{minutes % 60:02d}:{seconds:02d}'
+        )
+
+
+async def fetch_week(crawler, season, href, parse_week, game_filter=None):
+    """
+    Function:
+        Fetch week page and every boxscore of it at once. A boxscore that
+        fails is returned with its error instead of a page.
+
+    Input:
+        crawler: Crawler
+        season: int
+        href: str
+        parse_week: function(html, week, season) -> list(dict)
+        game_filter: function(game_info) -> bool
+
+    Output:
+        games: list((dict, bytes or Exception))
+    """
+    html = await crawler.get(page_url(href))
+    with METRICS.timer('parse_seconds', table='week_page'):
+        games = [
+            game_info for game_info in parse_week(html, week_number(href), season)
+            if game_filter is None or game_filter(game_info)
+        ]
+    pages = await asyncio.gather(
+        *(crawler.get(page_url(game_info['href'])) for game_info in games), return_exceptions=True
+    )
+
+    return list(zip(games, pages))
+
+
+async def backfill_seasons(seasons, parse_season, parse_week, parse_game, sink, week_filter=None,
+                           game_filter=None, weeks_in_flight=WEEKS_IN_FLIGHT, recent_first=False,
+                           max_in_flight=None, rates=None, dead_letters=None, ttls=None):
+    """
+    Function:
+        Backfill seasons as one queue of (season, week) units sharing one
+        crawler, so every request counts against the same per-host rate
+        budget. Up to weeks_in_flight weeks are fetched ahead of the one
+        being parsed, across season boundaries, and weeks are parsed in
+        queue order. Games of dead_letters, when given, are retried
+        first through the same crawler, and boxscores that fail after
+        their retries are added to it instead of ending the backfill.
+
+    Input:
+        seasons: iterable(int)
+        parse_season: function(html) -> list(str)
+        parse_week: function(html, week, season) -> list(dict)
+        parse_game: function(html, game_info, sink)
+        sink: TableSink
+        week_filter: function(season, href) -> bool
+        game_filter: function(game_info) -> bool
+        weeks_in_flight: int
+        recent_first: bool, queue the latest seasons first
+        max_in_flight: int
+        rates: dict(str: (float, int))
+        dead_letters: DeadLetters
+        ttls: dict(str: int)
+
+    Output:
+        None
+    """
+    crawler = Crawler(max_in_flight, rates, ttls)
+    try:
+        game_filter = await retry_dead_letters(crawler, dead_letters, parse_game, sink, game_filter)
+
+        # Every week of every season, in queue order
+        seasons = sorted(seasons, reverse=recent_first)
+        season_pages = await asyncio.gather(*(crawler.get(page_url(f'/years/{season}/')) for season in seasons))
+        units = deque(
+            (season, href)
+            for season, html in zip(seasons, season_pages)
+            for href in parse_season(html)
+            if week_filter is None or week_filter(season, href)
+        )
+        progress = Progress(len(units))
+
+        # Keep weeks_in_flight weeks fetching, parse the oldest as it lands
+        fetching = deque()
+        while units or fetching:
+            while units and len(fetching) < weeks_in_flight:
+                season, href = units.popleft()
+                task = asyncio.create_task(fetch_week(crawler, season, href, parse_week, game_filter))
+                fetching.append((season, href, task))
+
+            season, href, task = fetching.popleft()
+            games = await task
+            for game_info, html in games:
+                if isinstance(html, BaseException):
+                    if dead_letters is None or not isinstance(html, FETCH_ERRORS):
+                        raise html
+                    print(f"\tFailed {game_info['href']}: {html!r}")
+                    dead_letters.add(game_info, html)
+                    continue
+                parse_game(html, game_info, sink)
+
+            progress.week_done(season, week_number(href), len(games))
+    finally:
+        crawler.close()
+
+
+def backfill(seasons, parse_season, parse_week, parse_game, sink, week_filter=None, game_filter=None,
+             weeks_in_flight=WEEKS_IN_FLIGHT, recent_first=False, max_in_flight=None, rates=None,
+             dead_letters=None, ttls=None):
+    """
+    Function:
+        Backfill seasons from synchronous code, see backfill_seasons
+
+    Input:
+        seasons: iterable(int)
+        parse_season: function(html) -> list(str)
+        parse_week: function(html, week, season) -> list(dict)
+        parse_game: function(html, game_info, sink)
+        sink: TableSink
+        week_filter: function(season, href) -> bool
+        game_filter: function(game_info) -> bool
+        weeks_in_flight: int
+        recent_first: bool
+        max_in_flight: int
+        rates: dict(str: (float, int))
+        dead_letters: DeadLetters
+        ttls: dict(str: int), cache TTLs of this backfill over fetch.PAGE_TTLS
+
+    Output:
+        None
+    """
+    asyncio.run(backfill_seasons(
+        seasons, parse_season, parse_week, parse_game, sink, week_filter, game_filter, weeks_in_flight,
+        recent_first, max_in_flight, rates, dead_letters, ttls
+    ))
@@ -0,0 +1,241 @@
+import json
+import os
+import shutil
+from backend.scraping.sink import TableSink
+
+
+CHECKPOINT_DIR = 'backend/data/games/checkpoint'
+
+# Seasons the checkpointed run was started for
+RUN_FILE = 'run.json'
+
+
+class Checkpoint:
+    """
+    Class:
+        Per-game checkpoint of a backfill. Each game's rows are appended to
+        one JSON-lines file per table, then the game's href and the size of
+        every table file are appended to a manifest. On restart, table files
+        are cut back to the last manifest entry, so rows of a game that died
+        halfway through are dropped and the game is scraped again. Each
+        scraper keeps its own checkpoint, and a run only resumes one that
+        was started for the same seasons.
+
+    Input:
+        name: str, one checkpoint per scraper, e.g. weekly_stats
+        seasons: iterable(int), seasons of the run
+        directory: str
+        sync: bool, fsync every commit so it survives a machine crash too
+    """
+    def __init__(self, name, seasons=None, directory=CHECKPOINT_DIR, sync=True):
+        self.directory = os.path.join(directory, name)
+        self.sync = sync
+        self.completed = set()
+        self.games = {}
+        self.offsets = {}
+        self.files = {}
+
+        os.makedirs(self.directory, exist_ok=True)
+        self.manifest_path = os.path.join(self.directory, 'manifest.jsonl')
+        self.read_manifest()
+        if seasons is not None:
+            self.check_seasons(seasons)
+
+    def check_seasons(self, seasons):
+        """
+        Function:
+            Record the seasons of the run, refusing to resume a checkpoint
+            started for other seasons
+
+        Input:
+            seasons: iterable(int)
+
+        Output:
+            None
+        """
+        seasons = sorted(int(season) for season in seasons)
+        run_path = os.path.join(self.directory, RUN_FILE)
+
+        if self.completed:
+            started = None
+            if os.path.exists(run_path):
+                with open(run_path) as f:
+                    started = json.load(f)['seasons']
+            if started != seasons:
+                raise ValueError(
+                    f'Checkpoint {self.directory} was started for seasons {started}, not {seasons}. '
+                    f'Finish that run or delete the checkpoint to start over.'
+                )
+            return
+
+        with open(run_path, 'w') as f:
+            json.dump({'seasons': seasons}, f)
+
+    def read_manifest(self):
+        """
+        Function:
+            Load completed games and committed table sizes
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        if not os.path.exists(self.manifest_path):
+            return
+
+        with open(self.manifest_path, 'rb') as f:
+            lines = f.read().split(b'\n')
+
+        committed = 0
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Partly written last line
+                break
+            self.completed.add(entry['href'])
+            self.games[entry['href']] = entry.get('game_info')
+            self.offsets = entry['offsets']
+            committed += len(line) + 1
+
+        # Drop any partly written tail
+        with open(self.manifest_path, 'r+b') as f:
+            f.truncate(committed)
+
+    def table_path(self, table):
+        """
+        Function:
+            Path of table's row file
+
+        Input:
+            table: str
+
+        Output:
+            path: str
+        """
+        return os.path.join(self.directory, f'{table}.jsonl')
+
+    def done(self, game_info):
+        """
+        Function:
+            Whether game was already committed
+
+        Input:
+            game_info: dict(str: str)
+
+        Output:
+            done: bool
+        """
+        return game_info['href'] in self.completed
+
+    def restore(self, sink):
+        """
+        Function:
+            Append committed rows to sink, dropping uncommitted ones
+
+        Input:
+            sink: TableSink
+
+        Output:
+            None
+        """
+        for table, offset in self.offsets.items():
+            path = self.table_path(table)
+            with open(path, 'r+b') as f:
+                f.truncate(offset)
+            with open(path, 'rb') as f:
+                for line in f:
+                    sink.append(table, json.loads(line))
+
+        # Uncommitted files of tables no game finished
+        for name in os.listdir(self.directory):
+            table = name[:-len('.jsonl')]
+            if name.endswith('.jsonl') and name != 'manifest.jsonl' and table not in self.offsets:
+                os.remove(os.path.join(self.directory, name))
+
+    def commit(self, game_info, batches):
+        """
+        Function:
+            Persist rows of game, then mark game complete
+
+        Input:
+            game_info: dict(str: str)
+            batches: dict(str: dict(str: list))
+
+        Output:
+            None
+        """
+        for table, columns in batches.items():
+            if table not in self.files:
+                self.files[table] = open(self.table_path(table), 'ab')
+            f = self.files[table]
+            f.write(json.dumps(columns).encode('utf-8') + b'\n')
+            f.flush()
+            if self.sync:
+                os.fsync(f.fileno())
+            self.offsets[table] = f.tell()
+
+        entry = {'href': game_info['href'], 'game_info': game_info, 'offsets': self.offsets}
+        with open(self.manifest_path, 'ab') as f:
+            f.write(json.dumps(entry).encode('utf-8') + b'\n')
+            f.flush()
+            if self.sync:
+                os.fsync(f.fileno())
+        self.completed.add(game_info['href'])
+        self.games[game_info['href']] = game_info
+
+    def close(self):
+        """
+        Function:
+            Close table files
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        for f in self.files.values():
+            f.close()
+        self.files = {}
+
+    def clear(self):
+        """
+        Function:
+            Remove checkpoint once the final output is written
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        self.close()
+        shutil.rmtree(self.directory)
+
+
+def checkpointed(parse_game, checkpoint):
+    """
+    Function:
+        Wrap parse_game so every game is committed to the checkpoint
+        before its rows reach the sink
+
+    Input:
+        parse_game: function(html, game_info, sink)
+        checkpoint: Checkpoint
+
+    Output:
+        parse: function(html, game_info, sink)
+    """
+    def parse(html, game_info, sink):
+        game_sink = TableSink()
+        parse_game(html, game_info, game_sink)
+
+        batches = game_sink.drain()
+        checkpoint.commit(game_info, batches)
+        for table, columns in batches.items():
+            sink.append(table, columns)
+
+    return parse
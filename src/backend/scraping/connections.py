@@ -0,0 +1,169 @@
+import gzip
+import http.client
+import sys
+import threading
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit
+
+
+USER_AGENT = f'Python-urllib/{sys.version_info.major}.{sys.version_info.minor}'
+
+# Seconds to wait on a connection
+TIMEOUT = 30
+
+# Redirects followed before giving up
+MAX_REDIRECTS = 5
+
+
+class ConnectionPool:
+    """
+    Class:
+        Keep-alive HTTP connections reused per host. Safe to share between
+        threads; each request borrows an idle connection or opens a new one.
+
+    Input:
+        timeout: float
+    """
+    def __init__(self, timeout=TIMEOUT):
+        self.timeout = timeout
+        self.idle = {}
+        self.lock = threading.Lock()
+        self.opened = 0
+
+    def connection(self, scheme, host):
+        """
+        Function:
+            Borrow an idle connection to host, or open one
+
+        Input:
+            scheme: str
+            host: str
+
+        Output:
+            connection: HTTPConnection
+            reused: bool
+        """
+        with self.lock:
+            idle = self.idle.get((scheme, host))
+            if idle:
+                return idle.pop(), True
+            self.opened += 1
+
+        if scheme == 'https':
+            return http.client.HTTPSConnection(host, timeout=self.timeout), False
+
+        return http.client.HTTPConnection(host, timeout=self.timeout), False
+
+    def release(self, scheme, host, connection):
+        """
+        Function:
+            Return connection to the idle list
+
+        Input:
+            scheme: str
+            host: str
+            connection: HTTPConnection
+
+        Output:
+            None
+        """
+        with self.lock:
+            self.idle.setdefault((scheme, host), []).append(connection)
+
+    def request(self, url, headers=None):
+        """
+        Function:
+            GET url over a pooled connection. Redirects are followed and
+            gzip bodies decompressed. Error statuses raise HTTPError like
+            urlopen, 304 is returned to the caller.
+
+        Input:
+            url: str
+            headers: dict(str: str)
+
+        Output:
+            status: int
+            body: bytes
+            headers: HTTPMessage
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            status, body, response_headers = self.get(url, headers or {})
+            if status in (301, 302, 303, 307, 308) and response_headers.get('Location'):
+                url = urljoin(url, response_headers['Location'])
+                continue
+
+            if status >= 400:
+                raise HTTPError(url, status, http.client.responses.get(status, ''), response_headers, None)
+
+            return status, body, response_headers
+
+        raise HTTPError(url, status, 'Too many redirects', response_headers, None)
+
+    def get(self, url, headers):
+        """
+        Function:
+            Single GET without redirects. A stale keep-alive connection
+            is retried once on a fresh one.
+
+        Input:
+            url: str
+            headers: dict(str: str)
+
+        Output:
+            status: int
+            body: bytes
+            headers: HTTPMessage
+        """
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path = f'{path}?{parts.query}'
+        headers = {
+            'User-Agent': USER_AGENT,
+            'Accept-Encoding': 'gzip',
+            'Connection': 'keep-alive',
+            **headers
+        }
+
+        while True:
+            connection, reused = self.connection(parts.scheme, parts.netloc)
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if reused:
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+            break
+
+        if response.will_close:
+            connection.close()
+        else:
+            self.release(parts.scheme, parts.netloc, connection)
+
+        if response.getheader('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+
+        return response.status, body, response.headers
+
+    def close(self):
+        """
+        Function:
+            Close every idle connection
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        with self.lock:
+            for connections in self.idle.values():
+                for connection in connections:
+                    connection.close()
+            self.idle = {}
@@ -0,0 +1,361 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from backend.scraping.fetch import FETCH_ERRORS, backoff, cached, fetch, paused_for
+from backend.scraping.metrics import METRICS
+
+
+# Site every page is requested from, e.g. a local mock server in tests
+BASE_URL = os.environ.get('SCRAPE_BASE_URL', 'https://www.pro-football-reference.com')
+
+# Max pages downloading at once
+MAX_IN_FLIGHT = 8
+
+# Requests per second and burst size allowed per host
+HOST_RATES = {
+    'www.pro-football-reference.com': (20 / 60, 3)
+}
+DEFAULT_RATE = (1, 1)
+
+
+def configure(base_url=None, max_in_flight=None, rates=None):
+    """
+    Function:
+        Configure crawling
+
+    Input:
+        base_url: str
+        max_in_flight: int
+        rates: dict(str: (float, int)), requests per second and burst per host
+
+    Output:
+        None
+    """
+    global BASE_URL, MAX_IN_FLIGHT
+
+    if base_url is not None:
+        BASE_URL = base_url.rstrip('/')
+    if max_in_flight is not None:
+        MAX_IN_FLIGHT = max_in_flight
+    if rates is not None:
+        HOST_RATES.update(rates)
+
+
+def page_url(href):
+    """
+    Function:
+        Absolute url of site link
+
+    Input:
+        href: str
+
+    Output:
+        url: str
+    """
+    return f'{BASE_URL}{href}'
+
+
+class TokenBucket:
+    """
+    Class:
+        Token bucket rate limiter. Tokens refill at rate per second
+        up to capacity, each request spends one token.
+
+    Input:
+        rate: float
+        capacity: int
+    """
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """
+        Function:
+            Wait until a token is available and spend it
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class Crawler:
+    """
+    Class:
+        Concurrent page getter. Cache hits return immediately, network
+        fetches are bounded by max_in_flight and a token bucket per host.
+        Fetches run on threads of their own, max_in_flight of them, rather
+        than the loop's default executor, which is smaller on few cores.
+
+    Input:
+        max_in_flight: int, MAX_IN_FLIGHT when None
+        rates: dict(str: (float, int))
+        ttls: dict(str: int), cache TTLs of this crawl over fetch.PAGE_TTLS
+    """
+    def __init__(self, max_in_flight=None, rates=None, ttls=None):
+        self.semaphore = asyncio.Semaphore(max_in_flight or MAX_IN_FLIGHT)
+        self.executor = ThreadPoolExecutor(max_in_flight or MAX_IN_FLIGHT, thread_name_prefix='fetch')
+        self.rates = {**HOST_RATES, **(rates or {})}
+        self.buckets = {}
+        self.ttls = ttls
+
+    def close(self):
+        """
+        Function:
+            Stop fetch threads
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def bucket(self, host):
+        """
+        Function:
+            Token bucket of host
+
+        Input:
+            host: str
+
+        Output:
+            bucket: TokenBucket
+        """
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(*self.rates.get(host, DEFAULT_RATE))
+
+        return self.buckets[host]
+
+    async def get(self, url):
+        """
+        Function:
+            Get page, from cache when fresh. Failed fetches are retried
+            here rather than on the fetch thread, so every retry waits out
+            its backoff on the loop and spends a token of the host bucket.
+
+        Input:
+            url: str
+
+        Output:
+            html: bytes
+        """
+        html = cached(url, self.ttls)
+        if html is not None:
+            return html
+
+        host = urlparse(url).netloc
+        attempt = 0
+        while True:
+            async with self.semaphore:
+                # Wait out a Retry-After pause of host before taking a token
+                await asyncio.sleep(paused_for(host))
+                with METRICS.timer('rate_wait_seconds', host=host):
+                    await self.bucket(host).acquire()
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(
+                        self.executor, fetch, url, self.ttls, False
+                    )
+                except FETCH_ERRORS as error:
+                    attempt += 1
+                    delay = backoff(url, error, attempt)
+                    if delay is None:
+                        raise
+
+            # Back off without holding a slot
+            await asyncio.sleep(delay)
+
+
+def week_number(href):
+    """
+    Function:
+        Week number of week page link
+
+    Input:
+        href: str
+
+    Output:
+        week: str
+    """
+    return href.split('/')[-1].split('_')[-1].split('.')[0]
+
+
+async def retry_dead_letters(crawler, dead_letters, parse_game, sink, game_filter=None):
+    """
+    Function:
+        Retry the games of dead_letters through crawler before the crawl,
+        and filter the recovered ones out of it
+
+    Input:
+        crawler: Crawler
+        dead_letters: DeadLetters
+        parse_game: function(html, game_info, sink)
+        sink: TableSink
+        game_filter: function(game_info) -> bool
+
+    Output:
+        game_filter: function(game_info) -> bool
+    """
+    if dead_letters is None:
+        return game_filter
+
+    recovered = await dead_letters.retry(crawler, parse_game, sink)
+    if not recovered:
+        return game_filter
+
+    def crawled(game_info):
+        if game_info['href'] in recovered:
+            return False
+        return game_filter is None or game_filter(game_info)
+
+    return crawled
+
+
+async def crawl_season(crawler, season, parse_season, parse_week, parse_game, sink, week_filter=None,
+                       game_filter=None, dead_letters=None):
+    """
+    Function:
+        Crawl season. Week pages are fetched concurrently, and the boxscores
+        of the next week are fetched while the current week is parsed.
+        Games are parsed in week order. Boxscores that still fail after
+        their retries go to dead_letters, when given, instead of ending
+        the crawl.
+
+    Input:
+        crawler: Crawler
+        season: int
+        parse_season: function(html) -> list(str)
+        parse_week: function(html, week, season) -> list(dict)
+        parse_game: function(html, game_info, sink)
+        sink: TableSink
+        week_filter: function(season, href) -> bool
+        game_filter: function(game_info) -> bool
+        dead_letters: DeadLetters
+
+    Output:
+        None
+    """
+    # Print statement to track progress
+    print(f'Season: {season}')
+
+    html = await crawler.get(page_url(f'/years/{season}/'))
+    week_hrefs = [href for href in parse_season(html) if week_filter is None or week_filter(season, href)]
+
+    # Fetch every week page at once
+    week_tasks = [asyncio.create_task(crawler.get(page_url(href))) for href in week_hrefs]
+
+    async def parse_games(week, game_tasks):
+        print(f'\tWeek: {week}')
+        for game_info, task in game_tasks:
+            try:
+                html = await task
+            except FETCH_ERRORS as error:
+                if dead_letters is None:
+                    raise
+                print(f"\t\tFailed {game_info['href']}: {error!r}")
+                dead_letters.add(game_info, error)
+                continue
+            print(f"\t\t{game_info['away']} @ {game_info['home']}, {game_info['date'].strip()}")
+            parse_game(html, game_info, sink)
+
+    # Start next week's boxscores before parsing the current week
+    pending = None
+    for href, week_task in zip(week_hrefs, week_tasks):
+        week = week_number(href)
+        html = await week_task
+        with METRICS.timer('parse_seconds', table='week_page'):
+            games = [
+                game_info for game_info in parse_week(html, week, season)
+                if game_filter is None or game_filter(game_info)
+            ]
+        game_tasks = [
+            (game_info, asyncio.create_task(crawler.get(page_url(game_info['href']))))
+            for game_info in games
+        ]
+        if pending is not None:
+            await parse_games(*pending)
+        pending = (week, game_tasks)
+
+    if pending is not None:
+        await parse_games(*pending)
+
+
+async def crawl_seasons(seasons, parse_season, parse_week, parse_game, sink, week_filter=None,
+                        game_filter=None, max_in_flight=None, rates=None, dead_letters=None, ttls=None):
+    """
+    Function:
+        Crawl seasons one after another, sharing one crawler. Dead letters
+        are retried first through the same crawler.
+
+    Input:
+        seasons: iterable(int)
+        parse_season: function(html) -> list(str)
+        parse_week: function(html, week, season) -> list(dict)
+        parse_game: function(html, game_info, sink)
+        sink: TableSink
+        week_filter: function(season, href) -> bool
+        game_filter: function(game_info) -> bool
+        max_in_flight: int
+        rates: dict(str: (float, int))
+        dead_letters: DeadLetters
+        ttls: dict(str: int)
+
+    Output:
+        None
+    """
+    crawler = Crawler(max_in_flight, rates, ttls)
+    try:
+        game_filter = await retry_dead_letters(crawler, dead_letters, parse_game, sink, game_filter)
+        for season in seasons:
+            await crawl_season(
+                crawler, season, parse_season, parse_week, parse_game, sink, week_filter, game_filter, dead_letters
+            )
+    finally:
+        crawler.close()
+
+
+def crawl(seasons, parse_season, parse_week, parse_game, sink, week_filter=None,
+          game_filter=None, max_in_flight=None, rates=None, dead_letters=None, ttls=None):
+    """
+    Function:
+        Crawl seasons concurrently from synchronous code. The parse
+        functions run unchanged on the fetched pages.
+
+    Input:
+        seasons: iterable(int)
+        parse_season: function(html) -> list(str)
+        parse_week: function(html, week, season) -> list(dict)
+        parse_game: function(html, game_info, sink)
+        sink: TableSink
+        week_filter: function(season, href) -> bool
+        game_filter: function(game_info) -> bool
+        max_in_flight: int
+        rates: dict(str: (float, int))
+        dead_letters: DeadLetters
+        ttls: dict(str: int), cache TTLs of this crawl over fetch.PAGE_TTLS
+
+    Output:
+        None
+    """
+    asyncio.run(crawl_seasons(
+        seasons, parse_season, parse_week, parse_game, sink, week_filter, game_filter, max_in_flight, rates,
+        dead_letters, ttls
+    ))
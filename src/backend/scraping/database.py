@@ -0,0 +1,176 @@
+import contextlib
+import os
+import sqlite3
+import pandas as pd
+from backend.scraping import driver
+
+
+# Embedded database holding the same tables as the MySQL schema
+DATABASE_PATH = driver.SQLITE_PATH
+
+# Settings of every connection: readers never wait on the weekly load,
+# and pages are read through memory mapping and a large cache
+PRAGMAS = {
+    'synchronous': 'NORMAL',
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+    'mmap_size': 256 * 1024 * 1024
+}
+
+# Indexes beside the primary keys, which already lead with season and team
+INDEXES = [
+    *(f"CREATE INDEX IF NOT EXISTS {table}Player ON {table}(PId)" for table in driver.STAT_FILES),
+    "CREATE INDEX IF NOT EXISTS RostersPlayer ON Rosters(PId)",
+    "CREATE INDEX IF NOT EXISTS SchedulesHome ON Schedules(SId, Home)",
+    "CREATE INDEX IF NOT EXISTS SchedulesAway ON Schedules(SId, Away)"
+]
+
+# Aggregates allowed in aggregate
+AGGREGATES = ['SUM', 'AVG', 'MIN', 'MAX', 'COUNT']
+
+
+def connect(path=DATABASE_PATH, read_only=False):
+    """
+    Function:
+        Connect to the embedded database, no server needed. Writers put it
+        in WAL mode, so queries keep running during a load.
+
+    Input:
+        path: str
+        read_only: bool
+
+    Output:
+        db: sqlite3.Connection
+    """
+    if read_only:
+        db = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    else:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        db = sqlite3.connect(path)
+        db.execute("PRAGMA journal_mode = WAL")
+
+    for name, value in PRAGMAS.items():
+        db.execute(f"PRAGMA {name} = {value}")
+
+    return db
+
+
+def create_schema(db):
+    """
+    Function:
+        Create the tables and indexes that do not exist yet. Tables are
+        stored in primary key order, like InnoDB, so season and team scans
+        read rows in place instead of looking each one up.
+
+    Input:
+        db: sqlite3.Connection
+
+    Output:
+        None
+    """
+    cursor = db.cursor()
+    for ddl in driver.TABLES.values():
+        cursor.execute(f'{ddl.replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1)} WITHOUT ROWID')
+    for index in INDEXES:
+        cursor.execute(index)
+    db.commit()
+
+
+def load(frames, path=DATABASE_PATH, incremental=True, chunk_size=driver.CHUNK_SIZE):
+    """
+    Function:
+        Load scraped frames into the embedded database, cleaned like the
+        MySQL load. Incremental loads upsert only new or changed rows,
+        otherwise the tables of frames are emptied and reloaded.
+
+    Input:
+        frames: dict(str: DataFrame), scraped frame of each table
+        path: str
+        incremental: bool
+        chunk_size: int
+
+    Output:
+        rows: dict(str: int), rows written per table
+    """
+    with contextlib.closing(connect(path)) as db:
+        create_schema(db)
+        if incremental:
+            rows = driver.upsert_tables(db, frames, 'sqlite', chunk_size=chunk_size)
+        else:
+            cursor = db.cursor()
+            tables = [table for table in driver.TABLES if table in frames]
+            for table in reversed(tables):
+                cursor.execute(f"DELETE FROM {table}")
+            rows = {}
+            for table in tables:
+                rows[table] = driver.load_table(cursor, table, frames[table], 'sqlite', chunk_size=chunk_size)
+            db.commit()
+
+        # Refresh the statistics the query planner picks indexes with
+        db.execute("ANALYZE")
+
+    return rows
+
+
+def query(sql, params=(), path=DATABASE_PATH):
+    """
+    Function:
+        Run query against the embedded database
+
+    Input:
+        sql: str, with ? placeholders
+        params: iterable
+        path: str
+
+    Output:
+        df: DataFrame
+    """
+    with contextlib.closing(connect(path, read_only=True)) as db:
+        return pd.read_sql_query(sql, db, params=list(params))
+
+
+def aggregate(table, stats, by=('SId', 'TId'), seasons=None, teams=None, how='SUM', path=DATABASE_PATH):
+    """
+    Function:
+        Aggregate stats of table grouped by columns, e.g. season totals
+        of every team. Filters on season and team use the primary key.
+
+    Input:
+        table: str
+        stats: list(str), columns of table
+        by: iterable(str), columns of table
+        seasons: iterable(str), every season when None
+        teams: iterable(str), every team when None
+        how: str, one of AGGREGATES
+        path: str
+
+    Output:
+        df: DataFrame, one row per group with a column per stat
+    """
+    columns = [column for column, _, _ in driver.COLUMNS.get(table, [])]
+    unknown = [column for column in [*stats, *by] if column not in columns]
+    if not columns or unknown:
+        raise ValueError(f'Unknown table or columns: {table} {unknown}')
+    if how.upper() not in AGGREGATES:
+        raise ValueError(f'Unknown aggregate: {how}')
+
+    groups = ', '.join(f'`{column}`' for column in by)
+    select = [f'{how.upper()}(`{stat}`) AS `{stat}`' for stat in stats]
+    if groups:
+        select.insert(0, groups)
+
+    filters, params = [], []
+    for column, values in (('SId', seasons), ('TId', teams)):
+        if values is not None:
+            values = [str(value) for value in values]
+            filters.append(f"`{column}` IN ({', '.join(['?'] * len(values))})")
+            params.extend(values)
+
+    sql = f"SELECT {', '.join(select)} FROM {table}"
+    if filters:
+        sql += f" WHERE {' AND '.join(filters)}"
+    if groups:
+        sql += f" GROUP BY {groups} ORDER BY {groups}"
+
+    return query(sql, params, path)
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+import time
+from backend.scraping.crawler import page_url
+from backend.scraping.fetch import FETCH_ERRORS
+
+
+DEAD_LETTERS_DIR = 'backend/data/games/dead_letters'
+
+
+class DeadLetters:
+    """
+    Class:
+        Persisted list of games whose boxscore could not be fetched once
+        retries were spent. Each entry keeps the game's info, so the next
+        run retries them first and parses them like any other game.
+
+    Input:
+        name: str, one list per scraper, e.g. weekly_stats
+        directory: str
+    """
+    def __init__(self, name, directory=DEAD_LETTERS_DIR):
+        self.path = os.path.join(directory, f'{name}.json')
+        self.entries = {}
+
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.entries = {entry['game_info']['href']: entry for entry in json.load(f)}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def save(self):
+        """
+        Function:
+            Write entries, replacing the file at once so a killed run
+            never leaves half a list
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(list(self.entries.values()), f, indent=4)
+        os.replace(tmp_path, self.path)
+
+    def add(self, game_info, error):
+        """
+        Function:
+            Record game whose boxscore failed with error
+
+        Input:
+            game_info: dict(str: str)
+            error: Exception
+
+        Output:
+            None
+        """
+        entry = self.entries.get(game_info['href'], {'game_info': game_info, 'attempts': 0})
+        entry['attempts'] += 1
+        entry['error'] = repr(error)
+        entry['failed_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.entries[game_info['href']] = entry
+        self.save()
+
+    def remove(self, game_info):
+        """
+        Function:
+            Drop game once its boxscore was parsed
+
+        Input:
+            game_info: dict(str: str)
+
+        Output:
+            None
+        """
+        if self.entries.pop(game_info['href'], None) is not None:
+            self.save()
+
+    async def retry(self, crawler, parse_game, sink):
+        """
+        Function:
+            Fetch every dead-lettered game through crawler, sharing its
+            host rate budget with the rest of the crawl, and parse them.
+            Games that fail again stay on the list with one more attempt.
+
+        Input:
+            crawler: Crawler
+            parse_game: function(html, game_info, sink)
+            sink: TableSink
+
+        Output:
+            recovered: set(str), hrefs of the games parsed
+        """
+        entries = list(self.entries.values())
+        pages = await asyncio.gather(
+            *(crawler.get(page_url(entry['game_info']['href'])) for entry in entries), return_exceptions=True
+        )
+
+        recovered = set()
+        for entry, html in zip(entries, pages):
+            game_info = entry['game_info']
+            print(f"Retrying {game_info['away']} @ {game_info['home']}, {game_info['date'].strip()}")
+            if isinstance(html, BaseException):
+                if not isinstance(html, FETCH_ERRORS):
+                    raise html
+                self.add(game_info, html)
+                continue
+
+            parse_game(html, game_info, sink)
+            self.remove(game_info)
+            recovered.add(game_info['href'])
+
+        return recovered
@@ -1,83 +1,95 @@
-import mysql.connector
+import os
+import re
+import sqlite3
+import tempfile
 import pandas as pd
-import Rosters
-from Schedule import scrape_all_schedules
 
 
-def main():
-    db = mysql.connector.connect(
-        host="localhost",
-        user="tyler",
-        passwd="root",
-        db="SeniorProject"
-    )
+# Local stand-in for the MySQL database, for loading without a server
+SQLITE_PATH = 'backend/data/SeniorProject.db'
 
-    mycursor = db.cursor()
+# Query parameter marker of each database driver
+PLACEHOLDERS = {
+    'mysql': '%s',
+    'sqlite': '?'
+}
+
+# Null-safe equality of each database, matching two missing values
+NULL_SAFE_EQUALS = {
+    'mysql': '<=>',
+    'sqlite': 'IS'
+}
+
+# Dropping a staging table, without MySQL's implicit commit of DROP TABLE
+DROP_TEMPORARY = {
+    'mysql': 'DROP TEMPORARY TABLE IF EXISTS {table}',
+    'sqlite': 'DROP TABLE IF EXISTS temp.{table}'
+}
 
-    mycursor.execute("DROP TABLE IF EXISTS Rosters")
-    mycursor.execute("DROP TABLE IF EXISTS Schedules")
-    mycursor.execute("DROP TABLE IF EXISTS PlayerDefense")
-    mycursor.execute("DROP TABLE IF EXISTS PlayerPassing")
-    mycursor.execute("DROP TABLE IF EXISTS PlayerReceiving")
-    mycursor.execute("DROP TABLE IF EXISTS PlayerRushing")
-    mycursor.execute("DROP TABLE IF EXISTS PlayerKicking")
-    mycursor.execute("DROP TABLE IF EXISTS PlayerPunting")
-    mycursor.execute("DROP TABLE IF EXISTS Players")
-
-    mycursor.execute("SHOW TABLES")
-    for table in mycursor:
-        print(table)
-
-    mycursor.execute("""
+# Staging table of each table is named with this prefix
+STAGE_PREFIX = 'Stage'
+
+# Rows sent per INSERT statement, well under MySQL's packet size and
+# SQLite's limit of bound parameters
+CHUNK_SIZE = 1000
+
+# Cells scraped as a dash have no value
+MISSING = ["--", "-"]
+
+# Characters stripped from scraped numbers: thousands separators, and the
+# 't' marking a long play that went for a touchdown
+THOUSANDS = ','
+TOUCHDOWN = 't'
+
+# Tables in creation order, each referenced table before the tables using it
+TABLES = {
+    'Players': """
     CREATE TABLE Players(
         PId VARCHAR(10) PRIMARY KEY,
         Name VARCHAR(100),
         Age INTEGER,
         College VARCHAR(100)
-    )""")
-
-    mycursor.execute("""
+    )""",
+    'Rosters': """
     CREATE TABLE Rosters(
         SId VARCHAR(3),
         TId VARCHAR(3),
         PId VARCHAR(10),
         Pos VARCHAR(3),
-        G INTEGER, 
+        G INTEGER,
         GS INTEGER,
         Num DOUBLE,
         PRIMARY KEY (SId, TId, PId),
         FOREIGN KEY (SId) REFERENCES Seasons(SId),
         FOREIGN KEY (TId) REFERENCES Teams(TId),
         FOREIGN KEY (PId) REFERENCES Players(PId)
-    )""")
-
-    mycursor.execute("""
+    )""",
+    'PlayerPassing': """
     CREATE TABLE PlayerPassing(
         SId VARCHAR(3),
         TId VARCHAR(3),
         PId VARCHAR(10),
         Att INTEGER,
-        Cmp INTEGER, 
+        Cmp INTEGER,
         Yds INTEGER,
         YPA DOUBLE,
         YPG DOUBLE,
         TD INTEGER,
-        Ints INTEGER, 
+        Ints INTEGER,
         Sack INTEGER,
         QBR DOUBLE,
         PRIMARY KEY (SId, TId, PId),
         FOREIGN KEY (SId) REFERENCES Seasons(SId),
         FOREIGN KEY (TId) REFERENCES Teams(TId),
         FOREIGN KEY (PId) REFERENCES Players(PId)
-    )""")
-
-    mycursor.execute("""
+    )""",
+    'PlayerRushing': """
     CREATE TABLE PlayerRushing(
         SId VARCHAR(3),
         TId VARCHAR(3),
         PId VARCHAR(10),
         Att INTEGER,
-        Yds INTEGER, 
+        Yds INTEGER,
         Avg DOUBLE,
         YPG DOUBLE,
         Lg INTEGER,
@@ -87,15 +99,14 @@ def main():
         FOREIGN KEY (SId) REFERENCES Seasons(SId),
         FOREIGN KEY (TId) REFERENCES Teams(TId),
         FOREIGN KEY (PId) REFERENCES Players(PId)
-    )""")
-
-    mycursor.execute("""
+    )""",
+    'PlayerReceiving': """
     CREATE TABLE PlayerReceiving(
         SId VARCHAR(3),
         TId VARCHAR(3),
         PId VARCHAR(10),
         Rec INTEGER,
-        Yds INTEGER, 
+        Yds INTEGER,
         Avg DOUBLE,
         YPG DOUBLE,
         Lg INTEGER,
@@ -107,15 +118,14 @@ def main():
         FOREIGN KEY (SId) REFERENCES Seasons(SId),
         FOREIGN KEY (TId) REFERENCES Teams(TId),
         FOREIGN KEY (PId) REFERENCES Players(PId)
-    )""")
-
-    mycursor.execute("""
+    )""",
+    'PlayerDefense': """
     CREATE TABLE PlayerDefense(
         SId VARCHAR(3),
         TId VARCHAR(3),
         PId VARCHAR(10),
         Ints INTEGER,
-        IntYds INTEGER, 
+        IntYds INTEGER,
         IntAvg DOUBLE,
         IntLong INTEGER,
         IntTD INTEGER,
@@ -128,15 +138,14 @@ def main():
         FOREIGN KEY (SId) REFERENCES Seasons(SId),
         FOREIGN KEY (TId) REFERENCES Teams(TId),
         FOREIGN KEY (PId) REFERENCES Players(PId)
-    )""")
-
-    mycursor.execute("""
+    )""",
+    'PlayerKicking': """
     CREATE TABLE PlayerKicking(
         SId VARCHAR(3),
         TId VARCHAR(3),
         PId VARCHAR(10),
         FGM INTEGER,
-        FGA INTEGER, 
+        FGA INTEGER,
         FPct DOUBLE,
         `0-19` VARCHAR(10),
         `20-29` VARCHAR(10),
@@ -152,15 +161,14 @@ def main():
         FOREIGN KEY (SId) REFERENCES Seasons(SId),
         FOREIGN KEY (TId) REFERENCES Teams(TId),
         FOREIGN KEY (PId) REFERENCES Players(PId)
-    )""")
-
-    mycursor.execute("""
+    )""",
+    'PlayerPunting': """
     CREATE TABLE PlayerPunting(
         SId VARCHAR(3),
         TId VARCHAR(3),
         PId VARCHAR(10),
         Num INTEGER,
-        Yds INTEGER, 
+        Yds INTEGER,
         Avg DOUBLE,
         Lg INTEGER,
         TB INTEGER,
@@ -171,9 +179,8 @@ def main():
         FOREIGN KEY (SId) REFERENCES Seasons(SId),
         FOREIGN KEY (TId) REFERENCES Teams(TId),
         FOREIGN KEY (PId) REFERENCES Players(PId)
-    )""")
-
-    mycursor.execute("""
+    )""",
+    'Schedules': """
     CREATE TABLE Schedules(
         SId VARCHAR(3),
         TId VARCHAR(3),
@@ -194,137 +201,471 @@ def main():
         FOREIGN KEY (SId) REFERENCES Seasons(SId),
         FOREIGN KEY (Home) REFERENCES Teams(TId),
         FOREIGN KEY (Away) REFERENCES Teams(TId)
-    )""")
+    )""",
+}
+
+# Columns of each table, with the frame column it is loaded from and the
+# characters to strip from it
+COLUMNS = {
+    'Players': [
+        ('PId', 'PId', None), ('Name', 'Name', None), ('Age', 'Age', None), ('College', 'College', None)
+    ],
+    'Rosters': [
+        ('SId', 'SId', None), ('TId', 'TId', None), ('PId', 'PId', None), ('Pos', 'Pos', None),
+        ('G', 'G', None), ('GS', 'GS', None), ('Num', 'Number', None)
+    ],
+    'PlayerPassing': [
+        ('SId', 'SId', None), ('TId', 'TId', None), ('PId', 'PId', None), ('Att', 'Att', None),
+        ('Cmp', 'Cmp', None), ('Yds', 'Yds', THOUSANDS), ('YPA', 'YPA', None), ('YPG', 'YPG', None),
+        ('TD', 'TD', None), ('Ints', 'Int', None), ('Sack', 'Sack', None), ('QBR', 'QBR', None)
+    ],
+    'PlayerRushing': [
+        ('SId', 'SId', None), ('TId', 'TId', None), ('PId', 'PId', None), ('Att', 'Att', None),
+        ('Yds', 'Yds', THOUSANDS), ('Avg', 'Avg', None), ('YPG', 'YPG', None), ('Lg', 'Long', TOUCHDOWN),
+        ('TD', 'TD', None), ('10+', '10+', None)
+    ],
+    'PlayerReceiving': [
+        ('SId', 'SId', None), ('TId', 'TId', None), ('PId', 'PId', None), ('Rec', 'Rec', None),
+        ('Yds', 'Yds', THOUSANDS), ('Avg', 'Avg', None), ('YPG', 'YPG', None), ('Lg', 'Long', TOUCHDOWN),
+        ('TD', 'TD', None), ('20+', '20+', None), ('Tar', 'Tar', None), ('YAC', 'YAC', None)
+    ],
+    'PlayerDefense': [
+        ('SId', 'SId', None), ('TId', 'TId', None), ('PId', 'PId', None), ('Ints', 'Int', None),
+        ('IntYds', 'IntYds', None), ('IntAvg', 'IntAvg', None), ('IntLong', 'IntLong', TOUCHDOWN),
+        ('IntTD', 'IntTd', None), ('Solo', 'Solo', None), ('Ast', 'Ast', None), ('Tot', 'Tot', None),
+        ('Sack', 'Sack', None), ('SackYds', 'SackYds', None)
+    ],
+    'PlayerKicking': [
+        ('SId', 'SId', None), ('TId', 'TId', None), ('PId', 'PId', None), ('FGM', 'FGM', None),
+        ('FGA', 'FGA', None), ('FPct', 'FPct', None), ('0-19', '0-19', None), ('20-29', '20-29', None),
+        ('30-39', '30-39', None), ('40-49', '40-49', None), ('50+', '50+', None), ('Lg', 'Long', TOUCHDOWN),
+        ('XPM', 'XPM', None), ('XPA', 'XPA', None), ('XPct', 'XPct', None), ('Pts', 'Pts', None)
+    ],
+    'PlayerPunting': [
+        ('SId', 'SId', None), ('TId', 'TId', None), ('PId', 'PId', None), ('Num', 'Num', None),
+        ('Yds', 'Yds', THOUSANDS), ('Avg', 'Avg', None), ('Lg', 'Long', TOUCHDOWN), ('TB', 'TB', None),
+        ('In20', 'In20', None), ('50+', '50+', None), ('Blk', 'Blk', None)
+    ],
+    'Schedules': [
+        ('SId', 'SId', None), ('TId', 'TId', None), ('Date', 'Date', None), ('Home', 'Home', None),
+        ('Away', 'Away', None), ('H_Q1', 'H_Q1', None), ('H_Q2', 'H_Q2', None), ('H_Q3', 'H_Q3', None),
+        ('H_Q4', 'H_Q4', None), ('A_Q1', 'A_Q1', None), ('A_Q2', 'A_Q2', None), ('A_Q3', 'A_Q3', None),
+        ('A_Q4', 'A_Q4', None), ('H_Final', 'H_final', None), ('A_Final', 'A_final', None)
+    ]
+}
+
+# Primary key of each table, rows are upserted on it
+KEYS = {
+    table: ['PId'] if table == 'Players' else ['SId', 'TId', 'Date'] if table == 'Schedules' else ['SId', 'TId', 'PId']
+    for table in TABLES
+}
+
+# Stat tables read from the CSV files of the player scrapers
+STAT_FILES = {
+    'PlayerPassing': 'passing.csv',
+    'PlayerRushing': 'rushing.csv',
+    'PlayerReceiving': 'receiving.csv',
+    'PlayerDefense': 'defense.csv',
+    'PlayerKicking': 'kicking.csv',
+    'PlayerPunting': 'punting.csv'
+}
+
+
+def connect(backend='mysql', path=SQLITE_PATH):
+    """
+    Function:
+        Connect to the database, the MySQL server or a local SQLite file.
+        mysql.connector is only needed for the server.
+
+    Input:
+        backend: str, mysql or sqlite
+        path: str, SQLite file
+
+    Output:
+        db: connection
+    """
+    if backend == 'sqlite':
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        return sqlite3.connect(path)
+
+    import mysql.connector
+    return mysql.connector.connect(
+        host="localhost",
+        user="tyler",
+        passwd="root",
+        db="SeniorProject",
+        allow_local_infile=True
+    )
+
+
+def create_tables(cursor):
+    """
+    Function:
+        Drop and create every table
+
+    Input:
+        cursor: cursor
+
+    Output:
+        None
+    """
+    for table in reversed(list(TABLES)):
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+    for ddl in TABLES.values():
+        cursor.execute(ddl)
+
+
+def ensure_tables(cursor):
+    """
+    Function:
+        Create the tables that do not exist yet, keeping their rows
+
+    Input:
+        cursor: cursor
+
+    Output:
+        None
+    """
+    for ddl in TABLES.values():
+        cursor.execute(ddl.replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1))
+
+
+def strip(series, chars):
+    """
+    Function:
+        Remove chars from every value of series at once. Numeric columns
+        hold no text to strip, missing values stay missing.
+
+    Input:
+        series: Series
+        chars: str
+
+    Output:
+        series: Series
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+
+    return series.astype(str).str.replace(chars, '', regex=False).where(series.notna(), None)
+
+
+def schedule_dates(schedules):
+    """
+    Function:
+        ISO dates of schedule rows, from dates like "Sun 9/12" and the year
+
+    Input:
+        schedules: DataFrame
+
+    Output:
+        dates: Series
+    """
+    month_day = schedules["Date"].str.split().str[1].str.split('/', expand=True)
+
+    return schedules["Year"].astype(str) + "-" + month_day[0].str.zfill(2) + "-" + month_day[1].str.zfill(2)
+
+
+def clean_frame(table, df):
+    """
+    Function:
+        Columns of table from scraped frame, cleaned column by column
+
+    Input:
+        table: str
+        df: DataFrame
+
+    Output:
+        df: DataFrame, one column per table column, in table order
+    """
+    df = df.replace(MISSING, 0)
+    if table == 'Schedules':
+        df = df.assign(Date=schedule_dates(df))
+
+    columns = {}
+    for column, source, chars in COLUMNS[table]:
+        columns[column] = df[source] if chars is None else strip(df[source], chars)
+
+    return pd.DataFrame(columns, index=df.index)
+
+
+def row_chunks(df, chunk_size=CHUNK_SIZE):
+    """
+    Function:
+        Rows of frame as tuples of Python values, chunk_size at a time,
+        with None for missing values
+
+    Input:
+        df: DataFrame
+        chunk_size: int
+
+    Output:
+        rows: generator(list(tuple))
+    """
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size].astype(object)
+        yield list(chunk.where(chunk.notna(), None).itertuples(index=False, name=None))
+
+
+def insert_rows(cursor, table, df, placeholder, chunk_size=CHUNK_SIZE):
+    """
+    Function:
+        Insert rows of cleaned frame with one multi-row INSERT per chunk
+
+    Input:
+        cursor: cursor
+        table: str
+        df: DataFrame, cleaned by clean_frame
+        placeholder: str
+        chunk_size: int
+
+    Output:
+        None
+    """
+    names = ', '.join(f'`{column}`' for column in df.columns)
+    row = f"({', '.join([placeholder] * len(df.columns))})"
+    for rows in row_chunks(df, chunk_size):
+        cursor.execute(
+            f"INSERT INTO {table} ({names}) VALUES {', '.join([row] * len(rows))}",
+            [value for values in rows for value in values]
+        )
+
+
+def load_infile(cursor, table, df):
+    """
+    Function:
+        Load rows of cleaned frame with MySQL's LOAD DATA LOCAL INFILE,
+        through a temporary CSV file. The server must allow local_infile.
+
+    Input:
+        cursor: cursor
+        table: str
+        df: DataFrame, cleaned by clean_frame
+
+    Output:
+        None
+    """
+    names = ', '.join(f'`{column}`' for column in df.columns)
+    with tempfile.NamedTemporaryFile('w', suffix='.csv', newline='', delete=False) as f:
+        df.to_csv(f, header=False, index=False, na_rep='\\N', lineterminator='\n')
+    try:
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} "
+            f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' LINES TERMINATED BY '\\n' ({names})",
+            (f.name,)
+        )
+    finally:
+        os.remove(f.name)
+
+
+def load_table(cursor, table, df, backend='mysql', infile=False, chunk_size=CHUNK_SIZE, into=None):
+    """
+    Function:
+        Clean scraped frame and bulk load it into table
+
+    Input:
+        cursor: cursor
+        table: str
+        df: DataFrame, as scraped
+        backend: str, mysql or sqlite
+        infile: bool, LOAD DATA LOCAL INFILE instead of INSERTs, MySQL only
+        chunk_size: int
+        into: str, table loaded instead of table, e.g. its staging table
+
+    Output:
+        rows: int
+    """
+    df = clean_frame(table, df)
+    if infile and backend == 'mysql':
+        load_infile(cursor, into or table, df)
+    else:
+        insert_rows(cursor, into or table, df, PLACEHOLDERS[backend], chunk_size)
+
+    return len(df)
+
+
+def stage_ddl(table):
+    """
+    Function:
+        DDL of the temporary staging table of table: same columns and
+        primary key, no foreign keys
+
+    Input:
+        table: str
+
+    Output:
+        ddl: str
+    """
+    lines = [line for line in TABLES[table].split('\n') if 'FOREIGN KEY' not in line]
+    ddl = re.sub(r',\s*\)$', '\n    )', '\n'.join(lines))
+
+    return ddl.replace(f"CREATE TABLE {table}(", f"CREATE TEMPORARY TABLE {STAGE_PREFIX}{table}(", 1)
+
+
+def upsert_sql(table, backend='mysql'):
+    """
+    Function:
+        Statement inserting the staged rows of table, replacing the rows
+        with the same primary key
+
+    Input:
+        table: str
+        backend: str, mysql or sqlite
+
+    Output:
+        sql: str
+    """
+    columns = [column for column, _, _ in COLUMNS[table]]
+    names = ', '.join(f'`{column}`' for column in columns)
+    values = [column for column in columns if column not in KEYS[table]]
+    select = f"INSERT INTO {table} ({names}) SELECT {names} FROM {STAGE_PREFIX}{table}"
+
+    if backend == 'mysql':
+        updates = ', '.join(f'`{column}` = VALUES(`{column}`)' for column in values)
+        return f"{select} ON DUPLICATE KEY UPDATE {updates}"
+
+    keys = ', '.join(f'`{column}`' for column in KEYS[table])
+    updates = ', '.join(f'`{column}` = excluded.`{column}`' for column in values)
+    return f"{select} WHERE true ON CONFLICT ({keys}) DO UPDATE SET {updates}"
+
+
+def stage_table(cursor, table, df, backend='mysql', infile=False, chunk_size=CHUNK_SIZE):
+    """
+    Function:
+        Load scraped frame into a fresh staging table of table, leaving
+        table itself untouched
+
+    Input:
+        cursor: cursor
+        table: str
+        df: DataFrame, as scraped
+        backend: str, mysql or sqlite
+        infile: bool, LOAD DATA LOCAL INFILE instead of INSERTs, MySQL only
+        chunk_size: int
+
+    Output:
+        rows: int
+    """
+    cursor.execute(DROP_TEMPORARY[backend].format(table=f'{STAGE_PREFIX}{table}'))
+    cursor.execute(stage_ddl(table))
+
+    return load_table(cursor, table, df, backend, infile, chunk_size, into=f'{STAGE_PREFIX}{table}')
+
+
+def merge_table(cursor, table, backend='mysql'):
+    """
+    Function:
+        Upsert the staged rows of table that are new or changed, then drop
+        the staging table. Staged rows equal to a stored row are discarded
+        first, so unchanged rows are never rewritten.
+
+    Input:
+        cursor: cursor
+        table: str
+        backend: str, mysql or sqlite
+
+    Output:
+        rows: int, rows inserted or updated
+    """
+    stage = f'{STAGE_PREFIX}{table}'
+    equals = NULL_SAFE_EQUALS[backend]
+    same = ' AND '.join(
+        f'{table}.`{column}` {equals} {stage}.`{column}`' for column, _, _ in COLUMNS[table]
+    )
+    cursor.execute(f"DELETE FROM {stage} WHERE EXISTS (SELECT 1 FROM {table} WHERE {same})")
+
+    cursor.execute(f"SELECT COUNT(*) FROM {stage}")
+    rows = cursor.fetchone()[0]
+    if rows:
+        cursor.execute(upsert_sql(table, backend))
+    cursor.execute(DROP_TEMPORARY[backend].format(table=stage))
+
+    return rows
+
+
+def upsert_tables(db, frames, backend='mysql', infile=False, chunk_size=CHUNK_SIZE):
+    """
+    Function:
+        Incremental load: upsert only new or changed rows of each frame on
+        its table's primary key, instead of dropping and reloading every
+        table. Every frame is cleaned and staged first, then all tables are
+        merged in one transaction, so readers see either the old rows or
+        the new ones and the live tables are only written to briefly.
+
+    Input:
+        db: connection
+        frames: dict(str: DataFrame), scraped frame of each table to update
+        backend: str, mysql or sqlite
+        infile: bool, LOAD DATA LOCAL INFILE instead of INSERTs, MySQL only
+        chunk_size: int
+
+    Output:
+        rows: dict(str: int), rows inserted or updated per table
+    """
+    cursor = db.cursor()
+    ensure_tables(cursor)
+    db.commit()
+
+    # Stage in table order, referenced tables first
+    tables = [table for table in TABLES if table in frames]
+    for table in tables:
+        stage_table(cursor, table, frames[table], backend, infile, chunk_size)
+
+    try:
+        rows = {table: merge_table(cursor, table, backend) for table in tables}
+    except Exception:
+        db.rollback()
+        raise
+    db.commit()
+
+    return rows
+
+
+def main(backend='mysql', infile=False, incremental=False):
+    """
+    Function:
+        Load scraped rosters, player stats and schedules into the database.
+        By default every table is dropped and rebuilt. Incremental loads
+        upsert only the rows that are new or changed.
+
+    Input:
+        backend: str, mysql or sqlite
+        infile: bool, load with LOAD DATA LOCAL INFILE, MySQL only
+        incremental: bool, upsert instead of rebuilding
+
+    Output:
+        None
+    """
+    import Rosters
+    from Schedule import scrape_all_schedules
 
     rosters = Rosters.scrape_all_rosters()
-    rosters = rosters.replace(["--", "-"], 0)
     print("Rosters done")
 
-    # players
-    players = rosters.drop_duplicates(subset=["PId"])
-    sql = """INSERT INTO Players (PId, Name, Age, College)
-                VALUES (%s, %s, %s, %s)"""
-    values = []
-    for index, row in players.iterrows():
-        values.append((row["PId"], row["Name"], row["Age"], row["College"]))
-
-    mycursor.executemany(sql, values)
-
-    # rosters
-    sql = """INSERT INTO Rosters (SId, TId, PId, Pos, G, GS, Num)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)"""
-    values = []
-    for index, row in rosters.iterrows():
-        values.append((row["SId"], row["TId"], row["PId"], row["Pos"], row["G"], row["GS"], row["Number"]))
-
-    mycursor.executemany(sql, values)
-
-    passing = pd.read_csv("passing.csv")
-    rushing = pd.read_csv("rushing.csv")
-    receiving = pd.read_csv("receiving.csv")
-    defense = pd.read_csv("defense.csv")
-    kicking = pd.read_csv("kicking.csv")
-    punting = pd.read_csv("punting.csv")
-
-    # insert into passing
-    passing = passing.replace(["--", "-"], 0)
-    sql = """INSERT INTO PlayerPassing (SId, TId, PId, Att, Cmp, Yds, YPA, YPG, TD, Ints, Sack, QBR)
-    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-    values = []
-    for index, row in passing.iterrows():
-        values.append((row["SId"], row["TId"], row["PId"], row["Att"], row["Cmp"], row["Yds"].replace(',', ''),
-                       row["YPA"], row["YPG"], row["TD"], row["Int"], row["Sack"], row["QBR"]))
-
-    mycursor.executemany(sql, values)
-
-    # insert into rushing
-    rushing = rushing.replace(["--", "-"], 0)
-    sql = """INSERT INTO PlayerRushing (SId, TId, PId, Att, Yds, Avg, YPG, Lg, TD, `10+`)
-    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-    values = []
-    for index, row in rushing.iterrows():
-        values.append((row["SId"], row["TId"], row["PId"], row["Att"], row["Yds"].replace(',', ''),
-                       row["Avg"], row["YPG"], row["Long"].replace('t', ''), row["TD"], row["10+"]))
-
-    mycursor.executemany(sql, values)
-
-    # insert into receiving
-    receiving = receiving.replace(["--", "-"], 0)
-    sql = """INSERT INTO PlayerReceiving (SId, TId, PId, Rec, Yds, Avg, YPG, Lg, TD, `20+`, Tar, YAC)
-    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-    values = []
-    for index, row in receiving.iterrows():
-        values.append((row["SId"], row["TId"], row["PId"], row["Rec"], row["Yds"].replace(',', ''), row["Avg"],
-                       row["YPG"], str(row["Long"]).replace('t', ''), row["TD"], row["20+"], row["Tar"], row["YAC"]))
-
-    mycursor.executemany(sql, values)
-
-    # insert into defense
-    defense = defense.replace(["--", "-"], 0)
-    sql = """INSERT INTO
-    PlayerDefense (SId, TId, PId, Ints, IntYds, IntAvg, IntLong, IntTD, Solo, Ast, Tot, Sack, SackYds)
-    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-    values = []
-    for index, row in defense.iterrows():
-        values.append((row["SId"], row["TId"], row["PId"], row["Int"], row["IntYds"], row["IntAvg"],
-                       str(row["IntLong"]).replace('t', ''), row["IntTd"], row["Solo"], row["Ast"], row["Tot"],
-                       row["Sack"], row["SackYds"]))
-
-    mycursor.executemany(sql, values)
-
-    # insert into kicking
-    kicking = kicking.replace(["--", "-"], 0)
-    sql = """INSERT INTO
-    PlayerKicking (SId, TId, PId, FGM, FGA, FPct, `0-19`, `20-29`, `30-39`, `40-49`, `50+`, Lg, XPM, XPA, XPct, Pts)
-    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-    values = []
-    for index, row in kicking.iterrows():
-        values.append((row["SId"], row["TId"], row["PId"], row["FGM"], row["FGA"], row["FPct"], row["0-19"],
-                       row["20-29"], row["30-39"], row["40-49"], row["50+"], str(row["Long"]).replace('t', ''),
-                       row["XPM"], row["XPA"], row["XPct"], row["Pts"]))
-
-    mycursor.executemany(sql, values)
-
-    # insert into punting
-    punting = punting.replace(["--", "-"], 0)
-
-    sql = """INSERT INTO
-    PlayerPunting (SId, TId, PId, Num, Yds, Avg, Lg, TB, `In20`, `50+`, Blk)
-    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-    values = []
-    for index, row in punting.iterrows():
-        values.append((row["SId"], row["TId"], row["PId"], row["Num"], str(row["Yds"]).replace(',', ''), row["Avg"],
-                       str(row["Long"]).replace('t', ''), row["TB"], row["In20"], row["50+"], row["Blk"]))
-
-    mycursor.executemany(sql, values)
-
-    # insert into schedules
+    # Frame of each table, players from the rosters
+    frames = {
+        'Players': rosters.drop_duplicates(subset=["PId"]),
+        'Rosters': rosters
+    }
+    for table, path in STAT_FILES.items():
+        frames[table] = pd.read_csv(path)
+
     print("Schedules beginning")
-    schedules = scrape_all_schedules()
+    frames['Schedules'] = scrape_all_schedules()
     print("Schedules done")
-    sql = """INSERT INTO
-        Schedules (SId, TId, Date, Home, Away, H_Q1, H_Q2, H_Q3, H_Q4, A_Q1, A_Q2, A_Q3, A_Q4, H_Final, A_Final)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-    values = []
-    for index, row in schedules.iterrows():
-        date = row["Date"].split()[1].split('/')
-        month = date[0]
-        day = date[1]
-        year = row["Year"]
-        if len(month) == 1 and len(day) == 1:
-            date = year + "-0" + month + "-0" + day
-        elif len(month) == 1:
-            date = year + "-0" + month + "-" + day
-        elif len(day) == 1:
-            date = year + "-" + month + "-0" + day
-        else:
-            date = year + "-" + month + "-" + day
-        values.append((row["SId"], row["TId"], date, row["Home"], row["Away"], row["H_Q1"], row["H_Q2"], row["H_Q3"],
-                       row["H_Q4"], row["A_Q1"], row["A_Q2"], row["A_Q3"], row["A_Q4"], row["H_final"], row["A_final"]))
-
-    mycursor.executemany(sql, values)
 
-    db.commit()
+    db = connect(backend)
+    mycursor = db.cursor()
+
+    if incremental:
+        for table, rows in upsert_tables(db, frames, backend, infile).items():
+            print(f"{table}: {rows} rows inserted or updated")
+    else:
+        create_tables(mycursor)
+        for table, df in frames.items():
+            load_table(mycursor, table, df, backend, infile)
+        db.commit()
 
     mycursor.execute("SELECT * FROM Schedules")
     for player in mycursor:
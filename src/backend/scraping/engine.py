@@ -0,0 +1,511 @@
+import os
+from functools import partial
+import pandas as pd
+from bs4 import BeautifulSoup
+from backend.scraping.fetch import fetch
+from backend.scraping.backfill import backfill
+from backend.scraping.checkpoint import Checkpoint, checkpointed
+from backend.scraping.crawler import crawl, page_url, week_number
+from backend.scraping.dead_letters import DeadLetters
+from backend.scraping.extractors import EXTRACTORS
+from backend.scraping.metrics import METRICS
+from backend.scraping.pipeline import ParsePool
+from backend.scraping.schema import to_text
+from backend.scraping.sink import StreamingSink, TableSink
+from backend.scraping.seen import game_key
+from backend.scraping.store import append_table, drop_rows, partition_path, segments, write_table
+from backend.scraping.tables import find_tables
+
+
+# Every output the engine can fill from a boxscore
+OUTPUTS = list(EXTRACTORS)
+
+# Rows of a CSV file read at once when games are dropped from it
+CSV_CHUNK_SIZE = 100000
+
+
+def boxscore_elements(outputs):
+    """
+    Function:
+        Boxscore elements needed by outputs
+
+    Input:
+        outputs: list(str)
+
+    Output:
+        names: list(str)
+    """
+    names = []
+    for output in outputs:
+        for name in EXTRACTORS[output][1]:
+            if name not in names:
+                names.append(name)
+
+    return names
+
+
+def parse_game(html, game_info, sink, outputs=OUTPUTS):
+    """
+    Function:
+        Parse boxscore page of game once and run the extractor of every
+        output on it
+
+    Input:
+        html: bytes
+        game_info: dict(
+            str: str,
+            str: str,
+            str: str,
+            str: str,
+            str: str,
+            str: str
+        )
+        sink: TableSink
+        outputs: list(str)
+
+    Output:
+        None
+    """
+    # Index tables, including those hidden in comments
+    with METRICS.timer('parse_seconds', table='index'):
+        tables = find_tables(html, boxscore_elements(outputs))
+
+    # Scrape data for each output, timing it and counting its rows
+    for output in outputs:
+        extractor, names = EXTRACTORS[output]
+        rows = sink.appended.get(output, 0)
+        with METRICS.timer('parse_seconds', table=output):
+            extractor(*[tables.get(name) for name in names], game_info, sink)
+        METRICS.inc('rows', sink.appended.get(output, 0) - rows, table=output)
+
+
+def parser(outputs):
+    """
+    Function:
+        parse_game bound to outputs. Picklable, so it can be shipped to
+        parser processes.
+
+    Input:
+        outputs: list(str)
+
+    Output:
+        parse_game: function(html, game_info, sink)
+    """
+    return partial(parse_game, outputs=list(outputs))
+
+
+def parse_week(html, week, season):
+    """
+    Function:
+        Parse games listed on week page
+
+    Input:
+        html: bytes
+        week: str
+        season: int
+
+    Output:
+        games: list(dict(
+            str: str,
+            str: str,
+            str: str,
+            str: str,
+            str: str,
+            str: str
+        ))
+    """
+    soup = BeautifulSoup(html, features="lxml")
+
+    # Iterate over each game
+    games = []
+    for game in soup.find_all('div', attrs={'class': 'game_summary expanded nohover'}):
+        game_info = {
+            'date': game.find(
+                'table',
+                attrs={'class': 'teams'}
+            ).find_all('tr')[0].find('td').text.strip('\n'),
+
+            'week': week,
+
+            'season': season,
+
+            'away': game.find(
+                'table',
+                attrs={'class': 'teams'}
+            ).find_all('tr')[1].find('td').text,
+
+            'home': game.find(
+                'table',
+                attrs={'class': 'teams'}
+            ).find_all('tr')[2].find('td').text,
+
+            'href': game.find(
+                'table',
+                attrs={'class': 'teams'}
+            ).find_all('tr')[1].find(
+                'td',
+                attrs={'class': 'right gamelink'}
+            ).find('a')['href']
+        }
+        games.append(game_info)
+
+    return games
+
+
+def parse_season(html):
+    """
+    Function:
+        Parse week links listed on season page
+
+    Input:
+        html: bytes
+
+    Output:
+        week_hrefs: list(str)
+    """
+    soup = BeautifulSoup(html, features="lxml")
+
+    # Week links
+    week_hrefs = {a['href'] for a in soup.find_all('a') if '/week_' in a['href']}
+
+    return sorted(week_hrefs, key=lambda href: int(week_number(href)))
+
+
+def scrape_game(game_info, sink, outputs=OUTPUTS):
+    """
+    Function:
+        Scrape game into outputs
+
+    Input:
+        game_info: dict(
+            str: str,
+            str: str,
+            str: str,
+            str: str,
+            str: str,
+            str: str
+        )
+        sink: TableSink
+        outputs: list(str)
+
+    Output:
+        None
+    """
+    # Print matchup tp track progress
+    print(f"\t\t{game_info['away']} @ {game_info['home']}, {game_info['date'].strip()}")
+
+    # Connect
+    url = page_url(game_info['href'])
+    html = fetch(url)
+
+    parse_game(html, game_info, sink, outputs)
+
+
+def scrape_week(href, season, sink, outputs=OUTPUTS):
+    """
+    Function:
+        Scrapes games in week into outputs
+
+    Input:
+        href: str
+        season: int
+        sink: TableSink
+        outputs: list(str)
+
+    Output:
+        None
+    """
+    # Print week to track progress
+    week = week_number(href)
+    print(f'\tWeek: {week}')
+
+    # Connect
+    url = page_url(href)
+    html = fetch(url)
+
+    # Iterate over each game
+    for game_info in parse_week(html, week, season):
+        scrape_game(game_info, sink, outputs)
+
+
+def scrape_season(season, sink, outputs=OUTPUTS):
+    """
+    Function:
+        Scrapes games in season into outputs
+
+    Input:
+        season: int
+        sink: TableSink
+        outputs: list(str)
+
+    Output:
+        None
+    """
+    # Print statement to track progress
+    print(f'Season: {season}')
+
+    # Connect
+    url = page_url(f'/years/{season}/')
+    html = fetch(url)
+
+    # Iterate of each week
+    for href in parse_season(html):
+        scrape_week(href, season, sink, outputs)
+
+
+def run(outputs, seasons, sink=None, workers=0, checkpoint=None, week_filter=None, dead_letters=None,
+        game_filter=None, seen=None, weeks_in_flight=0, recent_first=False, ttls=None):
+    """
+    Function:
+        Crawl seasons once, fetching and parsing every boxscore a single
+        time no matter how many outputs are asked for. With a checkpoint,
+        games of an unfinished run are restored and skipped. With dead
+        letters, games that failed in earlier runs are retried first, and
+        games that fail in this one are added instead of ending the run.
+        With a seen index, pages are parsed only when their hash is new.
+        With weeks_in_flight, seasons are backfilled as one queue of weeks
+        instead of season by season.
+
+    Input:
+        outputs: list(str)
+        seasons: iterable(int)
+        sink: TableSink, a typed one when None
+        workers: int, parser processes, 0 parses in this process
+        checkpoint: Checkpoint
+        week_filter: function(season, href) -> bool
+        dead_letters: DeadLetters
+        game_filter: function(game_info) -> bool
+        seen: SeenIndex
+        weeks_in_flight: int, weeks fetched ahead, 0 crawls season by season
+        recent_first: bool, backfill the latest seasons first
+        ttls: dict(str: int), cache TTLs of this run over fetch.PAGE_TTLS
+
+    Output:
+        sink: TableSink
+    """
+    if sink is None:
+        sink = TableSink(outputs, typed=True)
+    parse = parser(outputs)
+
+    # Resume from the checkpoint of an unfinished run
+    if checkpoint is not None:
+        checkpoint.restore(sink)
+
+    def crawl_games(parse_game):
+        if seen is not None:
+            parse_game = seen.parser(parse_game)
+
+        # Dead letters are retried by the crawl, then every game not already parsed
+        def crawled(game_info):
+            if checkpoint is not None and checkpoint.done(game_info):
+                return False
+            return game_filter is None or game_filter(game_info)
+
+        if weeks_in_flight:
+            backfill(
+                seasons, parse_season, parse_week, parse_game, sink, week_filter, crawled,
+                weeks_in_flight=weeks_in_flight, recent_first=recent_first, dead_letters=dead_letters,
+                ttls=ttls
+            )
+        else:
+            crawl(
+                seasons, parse_season, parse_week, parse_game, sink, week_filter, crawled,
+                dead_letters=dead_letters, ttls=ttls
+            )
+
+    # Crawl seasons concurrently, parsing each game as it arrives
+    if workers:
+        with ParsePool(parse, sink, workers, checkpoint=checkpoint) as pool:
+            crawl_games(pool.submit)
+    else:
+        if checkpoint is not None:
+            parse = checkpointed(parse, checkpoint)
+        crawl_games(parse)
+
+    # Where the run spent its time
+    METRICS.report()
+    if dead_letters:
+        print(f'{len(dead_letters)} games failed, retried first next run: {dead_letters.path}')
+
+    return sink
+
+
+def write_tables(sink, tables=None):
+    """
+    Function:
+        Write tables of sink to CSV files and to the partitioned store.
+        A streaming sink is written one chunk at a time.
+
+    Input:
+        sink: TableSink
+        tables: list(str), every table of sink when None
+
+    Output:
+        None
+    """
+    for table in tables or sink:
+        path = f'backend/data/games/{table}.csv'
+        if not isinstance(sink, StreamingSink):
+            to_text(table, sink[table]).to_csv(path, index=False)
+            write_table(table, sink[table])
+            continue
+
+        # Partitions are replaced by their first chunk and appended to after
+        written = set()
+        with open(path, 'w', newline='') as f:
+            header = True
+            for df in sink.frames(table):
+                to_text(table, df).to_csv(f, header=header, index=False)
+                header = False
+
+                weeks = pd.Series(list(zip(df['season'], df['week'])), index=df.index)
+                started = weeks.isin(written)
+                if (~started).any():
+                    write_table(table, df[~started])
+                if started.any():
+                    append_table(table, df[started])
+                written.update(weeks)
+            if header:
+                pd.DataFrame().to_csv(f, index=False)
+
+
+def append_tables(sink, tables=None):
+    """
+    Function:
+        Append tables of sink to the CSV files and the partitioned store.
+        Existing rows are not read or rewritten. New columns are lined up
+        with the header already in the CSV file.
+
+    Input:
+        sink: TableSink
+        tables: list(str), every table of sink when None
+
+    Output:
+        None
+    """
+    for table in tables or sink:
+        df = sink[table]
+        if df.empty:
+            continue
+
+        path = f'backend/data/games/{table}.csv'
+        if os.path.exists(path):
+            header = pd.read_csv(path, nrows=0).columns
+            to_text(table, df).reindex(columns=header).to_csv(path, mode='a', header=False, index=False)
+        else:
+            to_text(table, df).to_csv(path, index=False)
+        append_table(table, df)
+
+
+def drop_csv_rows(path, keep):
+    """
+    Function:
+        Rewrite CSV file with only the rows keep selects, chunk by chunk so
+        memory stays flat. The file is left alone when no row is dropped.
+
+    Input:
+        path: str
+        keep: function(DataFrame) -> boolean Series
+
+    Output:
+        dropped: int
+    """
+    dropped = 0
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', newline='') as f:
+        header = True
+        for df in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=CSV_CHUNK_SIZE):
+            kept = keep(df)
+            dropped += int((~kept).sum())
+            df[kept].to_csv(f, header=header, index=False)
+            header = False
+
+    if dropped:
+        os.replace(tmp, path)
+    else:
+        os.remove(tmp)
+
+    return dropped
+
+
+def drop_games(games, tables):
+    """
+    Function:
+        Remove rows of games from the CSV files and the store, before the
+        rows of their changed pages are appended again. Only tables with
+        rows in the games' weeks are touched. The store rewrites just those
+        week partitions, but a CSV file has no partitions, so each affected
+        CSV file is read and rewritten in full.
+
+    Input:
+        games: list(dict(str: str))
+        tables: list(str)
+
+    Output:
+        None
+    """
+    keys = {game_key(game['season'], game['week'], game['away'], game['home']) for game in games}
+    weeks = {key[:2] for key in keys}
+
+    def kept(df):
+        teams = ['away', 'home'] if 'away' in df else ['team', 'opponent']
+        return ~pd.Series([
+            game_key(*row) in keys for row in zip(df['season'], df['week'], df[teams[0]], df[teams[1]])
+        ], index=df.index, dtype=bool)
+
+    for table in tables:
+        # A table with no rows in those weeks holds none of the games
+        if not any(segments(partition_path(table, season, week)) for season, week in weeks):
+            continue
+
+        for season, week in weeks:
+            drop_rows(table, season, week, kept)
+        path = f'backend/data/games/{table}.csv'
+        if os.path.exists(path):
+            drop_csv_rows(path, kept)
+
+
+def main(seasons=range(2010, 2023), workers=0):
+    """
+    Function:
+        Scrapes every output since 2010 in one crawl. Each boxscore is
+        fetched and parsed once. Every game is checkpointed, so a rerun
+        after a crash continues where it died. Rows are spilled to disk
+        week by week, so memory stays flat over any number of seasons.
+        Writes following DataFrames to CSV files:
+            ~ scores
+            ~ scoring
+            ~ team_stats
+            ~ player_offense
+            ~ player_defense
+            ~ returns
+            ~ kicking
+            ~ starters
+            ~ drives
+            ~ schedule
+
+    Input:
+        seasons: iterable(int)
+        workers: int, parser processes, 0 parses in this process
+
+    Output:
+        None
+    """
+    checkpoint = Checkpoint('engine', seasons)
+    sink = run(
+        OUTPUTS, seasons,
+        sink=StreamingSink(OUTPUTS),
+        workers=workers,
+        checkpoint=checkpoint,
+        dead_letters=DeadLetters('engine')
+    )
+
+    # Write DataFrames to CSV files
+    write_tables(sink)
+
+    sink.close()
+    checkpoint.clear()
+
+
+if __name__ == '__main__':
+    main()
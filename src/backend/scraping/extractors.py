@@ -0,0 +1,459 @@
+from backend.scraping.tables import body_rows, cell_text, header_labels, read_rows
+
+
+def scrape_home_away_tag(tag, game_info, type, drives=False):
+    """
+    Function: 
+        Scrape tag
+
+    Input:
+        tag: element
+        game_info: dict(
+            str: str, 
+            str: str, 
+            str: str, 
+            str: str,
+            str: str,
+            str: str
+        )
+
+    Output:
+        df: dict(str: list)
+    """
+    labels = header_labels(tag)
+    columns, sections, tips = read_rows(tag, keep_classed=drives, tip_stats=['play_count_tip'] if drives else [])
+    rows = len(sections)
+
+    team = game_info['away'] if type == 'away' else game_info['home']
+    opponent = game_info['home'] if type == 'away' else game_info['away']
+    home = False if type == 'away' else True
+
+    df = {
+        'date': [game_info['date']] * rows,
+        'week': [game_info['week']] * rows,
+        'season': [game_info['season']] * rows,
+        'team': [team] * rows,
+        'opponent': [opponent] * rows,
+        'home_field': [home] * rows
+    }
+    for label in labels:
+        if label not in df:
+            df[label] = columns.get(label, [])
+
+    # Raw play count tip, e.g. '5 Rush, 3 Pass, 1 Penalty', expanded by process_drives
+    if drives:
+        df['play_types'] = tips['play_count_tip']
+
+    return df
+
+
+def scrape_tag(tag, game_info):
+    """
+    Function: 
+        Scrape tag
+
+    Input:
+        tag: element
+        game_info: dict(
+            str: str, 
+            str: str, 
+            str: str, 
+            str: str,
+            str: str,
+            str: str
+        )
+
+    Output:
+        df: dict(str: list)
+    """
+    if tag is None:
+        return {}
+
+    labels = header_labels(tag)
+    columns, sections, _ = read_rows(tag)
+
+    # Away players are listed first, home players after the first break row
+    home = [section > 0 for section in sections]
+    df = {
+        'date': [game_info['date']] * len(home),
+        'week': [game_info['week']] * len(home),
+        'season': [game_info['season']] * len(home),
+        'team': [game_info['home'] if home_field else game_info['away'] for home_field in home],
+        'opponent': [game_info['away'] if home_field else game_info['home'] for home_field in home],
+        'home_field': home
+    }
+    for label in labels:
+        if label not in df:
+            df[label] = columns.get(label, [])
+
+    return df
+
+
+def scrape_scores(scores, three_straight, game_info, sink):
+    """
+    Function: 
+        Scrape scores
+
+    Input:
+        scores: element
+        three_straight: element
+        game_info: dict(
+            str: str, 
+            str: str, 
+            str: str, 
+            str: str,
+            str: str,
+            str: str
+        )
+        sink: TableSink
+
+    Output:
+        None
+    """
+    df = {
+        'date': [game_info['date'], game_info['date']],
+        'week': [game_info['week'], game_info['week']],
+        'season': [game_info['season'], game_info['season']],
+        'team': [game_info['away'], game_info['home']],
+        'opponent': [game_info['home'], game_info['away']],
+        'home_field': [False, True]
+    }
+    quarters = [cell_text(th) for th in scores.iter('th')][2:]
+    for quarter in quarters:
+        df[quarter] = []
+    for row in body_rows(scores):
+        for quarter, td in zip(quarters, list(row.iter('td'))[2:]):
+            df[quarter].append(cell_text(td))
+
+    # Three straight scores, from one read of the scoring table
+    columns, _, _ = read_rows(three_straight)
+    teams = columns['team']
+    first_score_team = teams[0]
+    first_score_quarter = columns['quarter'][0]
+    first_score_time = columns['time'][0]
+
+    three_straight_scores = False
+    last_score = teams[0]
+    count = 1
+    for team in teams[1:]:
+        if team == last_score:
+            count += 1
+            if count >= 3:
+                three_straight_scores = True
+        else:
+            count = 1
+            last_score = team
+    
+    df['3_straight'] = [three_straight_scores, three_straight_scores]
+    df['first_score_team'] = [first_score_team, first_score_team]
+    df['first_score_quarter'] = [first_score_quarter, first_score_quarter]
+    df['first_score_time'] = [first_score_time, first_score_time]
+    
+    sink.append('scores', df)
+
+
+def scrape_team_stats(team_stats, game_info, sink):
+    """
+    Function: 
+        Scrape team stats
+
+    Input:
+        team_stats: element
+        game_info: dict(
+            str: str, 
+            str: str, 
+            str: str, 
+            str: str,
+            str: str,
+            str: str
+        )
+        sink: TableSink
+
+    Output:
+        None
+    """
+    df = {
+        'date': [game_info['date'], game_info['date']],
+        'week': [game_info['week'], game_info['week']],
+        'season': [game_info['season'], game_info['season']],
+        'team': [game_info['away'], game_info['home']],
+        'opponent': [game_info['home'], game_info['away']],
+        'home_field': [False, True]
+    }
+
+    # Away and home value of each stat row
+    rows = [[cell_text(td) for td in tr.iter('td')] for tr in body_rows(team_stats)]
+    df['1st'] = rows[0]
+    df['rush_att'] = [text.split('-')[0] for text in rows[1]]
+    df['rush_yds'] = [text.split('-')[1] for text in rows[1]]
+    df['rush_tds'] = [text.split('-')[2] for text in rows[1]]
+    df['cmp'] = [text.split('-')[0] for text in rows[2]]
+    df['att'] = [text.split('-')[1] for text in rows[2]]
+    df['pass_yds'] = [text.split('-')[2] for text in rows[2]]
+    df['pass_tds'] = [text.split('-')[3] for text in rows[2]]
+    df['ints'] = [text.split('-')[4] for text in rows[2]]
+    df['sacks'] = [text.split('-')[0] for text in rows[3]]
+    df['sack_yds'] = [text.split('-')[1] for text in rows[3]]
+    df['net_pass_yds'] = rows[4]
+    df['total_yds'] = rows[5]
+    df['fum'] = [text.split('-')[0] for text in rows[6]]
+    df['fum_lost'] = [text.split('-')[1] for text in rows[6]]
+    df['to'] = rows[7]
+    df['pen'] = [text.split('-')[0] for text in rows[8]]
+    df['pen_yds'] = [text.split('-')[1] for text in rows[8]]
+    df['3rd_att'] = [text.split('-')[0] for text in rows[9]]
+    df['3rd_cmp'] = [text.split('-')[1] for text in rows[9]]
+    df['4th_att'] = [text.split('-')[0] for text in rows[10]]
+    df['4th_cmp'] = [text.split('-')[1] for text in rows[10]]
+    df['poss'] = rows[11]
+    
+    sink.append('team_stats', df)
+
+
+def scrape_player_offense(player_offense, game_info, sink):
+    """
+    Function: 
+        Scrape offensive player stats
+
+    Input:
+        player_offense: element
+        game_info: dict(
+            str: str, 
+            str: str, 
+            str: str, 
+            str: str,
+            str: str,
+            str: str
+        )
+        sink: TableSink
+
+    Output:
+        None
+    """
+    
+    df = scrape_tag(player_offense, game_info)
+
+    sink.append('player_offense', df)
+
+
+def scrape_player_defense(player_defense, game_info, sink):
+    """
+    Function: 
+        Scrape defensive player stats
+
+    Input:
+        player_defense: element
+        game_info: dict(
+            str: str, 
+            str: str, 
+            str: str, 
+            str: str,
+            str: str,
+            str: str
+        )
+        sink: TableSink
+
+    Output:
+        None
+    """
+    
+    df = scrape_tag(player_defense, game_info)
+
+    sink.append('player_defense', df)
+
+
+def scrape_returns(returns, game_info, sink):
+    """
+    Function: 
+        Scrape returning stats
+
+    Input:
+        returns: element
+        game_info: dict(
+            str: str, 
+            str: str, 
+            str: str, 
+            str: str,
+            str: str,
+            str: str
+        )
+        sink: TableSink
+
+    Output:
+        None
+    """
+    
+    df = scrape_tag(returns, game_info)
+
+    sink.append('returns', df)
+
+
+def scrape_kicking(kicking, game_info, sink):
+    """
+    Function: 
+        Scrape kicking stats
+
+    Input:
+        kicking: element
+        game_info: dict(
+            str: str, 
+            str: str, 
+            str: str, 
+            str: str,
+            str: str,
+            str: str
+        )
+        sink: TableSink
+
+    Output:
+        None
+    """
+    
+    df = scrape_tag(kicking, game_info)
+
+    sink.append('kicking', df)
+
+
+def scrape_starters(home_starters, away_starters, game_info, sink):
+    """
+    Function: 
+        Scrape starters
+
+    Input:
+        home_starters: element
+        away_starters: element
+        game_info: dict(
+            str: str, 
+            str: str, 
+            str: str, 
+            str: str,
+            str: str,
+            str: str
+        )
+        sink: TableSink
+
+    Output:
+        None
+    """
+    
+    home_df = scrape_home_away_tag(home_starters, game_info, 'home')
+    away_df = scrape_home_away_tag(away_starters, game_info, 'away')
+    
+    sink.append('starters', home_df)
+    sink.append('starters', away_df)
+
+
+def scrape_drives(home_drives, away_drives, game_info, sink):
+    """
+    Function: 
+        Scrape drives
+
+    Input:
+        home_drives: element
+        away_drives: element
+        game_info: dict(
+            str: str, 
+            str: str, 
+            str: str, 
+            str: str,
+            str: str,
+            str: str
+        )
+        sink: TableSink
+
+    Output:
+        None
+    """
+    
+    home_df = scrape_home_away_tag(home_drives, game_info, 'home', drives=True)
+    away_df = scrape_home_away_tag(away_drives, game_info, 'away', drives=True)
+    
+    sink.append('drives', home_df)
+    sink.append('drives', away_df)
+
+
+def scrape_scoring(scoring, game_info, sink):
+    """
+    Function: 
+        Scrape every scoring play of game in order. Quarter is only
+        listed on the first play of each quarter, the rest are filled
+        by process_scoring.
+
+    Input:
+        scoring: element
+        game_info: dict(
+            str: str, 
+            str: str, 
+            str: str, 
+            str: str,
+            str: str,
+            str: str
+        )
+        sink: TableSink
+
+    Output:
+        None
+    """
+    columns, sections, _ = read_rows(scoring)
+    rows = len(sections)
+
+    df = {
+        'date': [game_info['date']] * rows,
+        'week': [game_info['week']] * rows,
+        'season': [game_info['season']] * rows,
+        'away': [game_info['away']] * rows,
+        'home': [game_info['home']] * rows,
+        'play': list(range(1, rows + 1))
+    }
+    for label in header_labels(scoring):
+        df[label] = columns.get(label, [])
+
+    sink.append('scoring', df)
+
+
+def scrape_schedule(scorebox_meta, game_info, sink):
+    """
+    Function: 
+        Scrape schedule entry of game, dated from the scorebox
+
+    Input:
+        scorebox_meta: element
+        game_info: dict(
+            str: str, 
+            str: str, 
+            str: str, 
+            str: str,
+            str: str,
+            str: str
+        )
+        sink: TableSink
+
+    Output:
+        None
+    """
+    df = {
+        'week': [game_info['week']],
+        'season': [game_info['season']],
+        'away': [game_info['away']],
+        'home': [game_info['home']],
+        'href': [game_info['href']],
+        'date': [cell_text(scorebox_meta.find('.//div'))]
+    }
+
+    sink.append('schedule', df)
+
+
+# Output table -> (extractor, boxscore elements passed to it in order).
+# Every extractor is called as extractor(*elements, game_info, sink).
+EXTRACTORS = {
+    'scores': (scrape_scores, ['linescore', 'scoring']),
+    'scoring': (scrape_scoring, ['scoring']),
+    'team_stats': (scrape_team_stats, ['team_stats']),
+    'player_offense': (scrape_player_offense, ['player_offense']),
+    'player_defense': (scrape_player_defense, ['player_defense']),
+    'returns': (scrape_returns, ['returns']),
+    'kicking': (scrape_kicking, ['kicking']),
+    'starters': (scrape_starters, ['home_starters', 'vis_starters']),
+    'drives': (scrape_drives, ['home_drives', 'vis_drives']),
+    'schedule': (scrape_schedule, ['scorebox_meta'])
+}
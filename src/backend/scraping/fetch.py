@@ -0,0 +1,443 @@
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+from backend.scraping.connections import ConnectionPool
+from backend.scraping.metrics import METRICS
+
+
+# Cache location, relative to src/ like the rest of backend/data
+CACHE_DIR = os.environ.get('SCRAPE_CACHE_DIR', 'backend/data/cache/html')
+
+# Replay only from the cache, never touch the network
+OFFLINE = os.environ.get('SCRAPE_OFFLINE', '0') == '1'
+
+# Seconds a cached page stays fresh, None never expires
+PAGE_TTLS = {
+    'season': 24 * 60 * 60,
+    'week': 6 * 60 * 60,
+    'boxscore': None,
+    'other': 24 * 60 * 60
+}
+
+# Keep-alive connections shared by every fetch
+POOL = ConnectionPool()
+
+# Attempts after the first, and the exponential backoff between them in seconds
+RETRIES = 5
+BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+
+# Statuses worth another attempt, other errors are final
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Errors a fetch can end with once its retries are spent
+FETCH_ERRORS = (OSError, http.client.HTTPException)
+
+# Host -> monotonic time its Retry-After pause ends, shared by every fetch
+PAUSED_UNTIL = {}
+PAUSE_LOCK = threading.Lock()
+
+PAGE_TYPES = [
+    ('boxscore', re.compile(r'/boxscores/[^/]+\.htm$')),
+    ('week', re.compile(r'/years/\d{4}/week_\d+\.htm$')),
+    ('season', re.compile(r'/years/\d{4}/?$'))
+]
+
+
+def configure(cache_dir=None, offline=None, ttls=None, retries=None, backoff=None):
+    """
+    Function:
+        Configure fetch layer
+
+    Input:
+        cache_dir: str
+        offline: bool
+        ttls: dict(str: int)
+        retries: int
+        backoff: float
+
+    Output:
+        None
+    """
+    global CACHE_DIR, OFFLINE, RETRIES, BACKOFF
+
+    if cache_dir is not None:
+        CACHE_DIR = cache_dir
+    if offline is not None:
+        OFFLINE = offline
+    if ttls is not None:
+        PAGE_TTLS.update(ttls)
+    if retries is not None:
+        RETRIES = retries
+    if backoff is not None:
+        BACKOFF = backoff
+
+
+def page_type(url):
+    """
+    Function:
+        Classify url as season, week, boxscore or other page
+
+    Input:
+        url: str
+
+    Output:
+        page_type: str
+    """
+    for name, pattern in PAGE_TYPES:
+        if pattern.search(url):
+            return name
+
+    return 'other'
+
+
+def cache_path(url):
+    """
+    Function:
+        Path of cached page, content addressed by url
+
+    Input:
+        url: str
+
+    Output:
+        path: str
+    """
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    return os.path.join(CACHE_DIR, key[:2], f'{key}.html.gz')
+
+
+def read_cache(url, ttl):
+    """
+    Function:
+        Read page from cache if present and fresh
+
+    Input:
+        url: str
+        ttl: int
+
+    Output:
+        html: bytes
+    """
+    path = cache_path(url)
+    if not os.path.exists(path):
+        return None
+
+    if ttl is not None and time.time() - os.path.getmtime(path) > ttl:
+        return None
+
+    with gzip.open(path, 'rb') as f:
+        return f.read()
+
+
+def write_cache(url, html):
+    """
+    Function:
+        Write page to cache compressed
+
+    Input:
+        url: str
+        html: bytes
+
+    Output:
+        None
+    """
+    path = cache_path(url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Write then rename so a killed run never leaves a truncated page
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with gzip.open(tmp_path, 'wb') as f:
+        f.write(html)
+    os.replace(tmp_path, path)
+
+
+def validators_path(url):
+    """
+    Function:
+        Path of cached page's ETag and Last-Modified validators
+
+    Input:
+        url: str
+
+    Output:
+        path: str
+    """
+    return cache_path(url)[:-len('.html.gz')] + '.json'
+
+
+def read_validators(url):
+    """
+    Function:
+        Conditional GET headers for the cached copy of page
+
+    Input:
+        url: str
+
+    Output:
+        headers: dict(str: str)
+    """
+    path = validators_path(url)
+    if not os.path.exists(cache_path(url)) or not os.path.exists(path):
+        return {}
+
+    with open(path) as f:
+        validators = json.load(f)
+
+    headers = {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+
+    return headers
+
+
+def write_validators(url, headers):
+    """
+    Function:
+        Store ETag and Last-Modified of page response
+
+    Input:
+        url: str
+        headers: HTTPMessage
+
+    Output:
+        None
+    """
+    validators = {'etag': headers.get('ETag'), 'last_modified': headers.get('Last-Modified')}
+    path = validators_path(url)
+
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(validators, f)
+    os.replace(tmp_path, path)
+
+
+def cached(url, ttls=None):
+    """
+    Function:
+        Cached page if fresh. Offline mode accepts pages of any age.
+
+    Input:
+        url: str
+        ttls: dict(str: int), TTLs of this call over PAGE_TTLS
+
+    Output:
+        html: bytes
+    """
+    kind = page_type(url)
+    ttl = None if OFFLINE else {**PAGE_TTLS, **(ttls or {})}[kind]
+
+    start = time.perf_counter()
+    html = read_cache(url, ttl)
+    if html is not None:
+        METRICS.observe('fetch_seconds', time.perf_counter() - start, page_type=kind, source='cache')
+        METRICS.inc('fetch_bytes', len(html), page_type=kind, source='cache')
+
+    return html
+
+
+def retry_after(error):
+    """
+    Function:
+        Seconds the server asked to wait in the Retry-After header of
+        error, given in seconds or as an HTTP date
+
+    Input:
+        error: HTTPError
+
+    Output:
+        seconds: float, None when not given
+    """
+    value = error.headers.get('Retry-After') if error.headers is not None else None
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_delay(error, attempt):
+    """
+    Function:
+        Seconds to wait before attempt, or None when error is final.
+        Exponential backoff with full jitter, or the server's Retry-After
+        plus a little jitter so waiting fetches do not return at once.
+
+    Input:
+        error: Exception
+        attempt: int, 1 for the first retry
+
+    Output:
+        delay: float
+    """
+    if isinstance(error, HTTPError):
+        if error.code not in RETRY_STATUSES:
+            return None
+        seconds = retry_after(error)
+        if seconds is not None:
+            return seconds + random.uniform(0, BACKOFF)
+
+    return random.uniform(0, min(MAX_BACKOFF, BACKOFF * 2 ** (attempt - 1)))
+
+
+def paused_for(host):
+    """
+    Function:
+        Seconds left of a Retry-After pause of host
+
+    Input:
+        host: str
+
+    Output:
+        seconds: float, 0 when not paused
+    """
+    with PAUSE_LOCK:
+        until = PAUSED_UNTIL.get(host, 0)
+
+    return max(0.0, until - time.monotonic())
+
+
+def wait_for_host(host):
+    """
+    Function:
+        Sleep out a Retry-After pause of host
+
+    Input:
+        host: str
+
+    Output:
+        None
+    """
+    seconds = paused_for(host)
+    if seconds:
+        time.sleep(seconds)
+
+
+def pause_host(host, seconds):
+    """
+    Function:
+        Hold every fetch to host for seconds
+
+    Input:
+        host: str
+        seconds: float
+
+    Output:
+        None
+    """
+    with PAUSE_LOCK:
+        PAUSED_UNTIL[host] = max(PAUSED_UNTIL.get(host, 0), time.monotonic() + seconds)
+
+
+def backoff(url, error, attempt):
+    """
+    Function:
+        Seconds to wait before retrying url, or None when error is final
+        or the retries are spent. A 429 pauses every fetch to its host for
+        its Retry-After instead, and 0 is returned.
+
+    Input:
+        url: str
+        error: Exception
+        attempt: int, 1 for the first retry
+
+    Output:
+        delay: float
+    """
+    delay = retry_delay(error, attempt) if attempt <= RETRIES else None
+    if delay is None:
+        return None
+
+    reason = error.code if isinstance(error, HTTPError) else type(error).__name__
+    METRICS.inc('fetch_retries', page_type=page_type(url), reason=reason)
+    if isinstance(error, HTTPError) and error.code == 429:
+        pause_host(urlsplit(url).netloc, delay)
+        return 0.0
+
+    return delay
+
+
+def request(url, retry=True):
+    """
+    Function:
+        GET page, retrying throttled, failed and dropped requests with
+        backoff unless retry is off. A 429 pauses every fetch to its host
+        for its Retry-After.
+
+    Input:
+        url: str
+        retry: bool
+
+    Output:
+        status: int
+        html: bytes
+        headers: HTTPMessage
+    """
+    host = urlsplit(url).netloc
+    attempt = 0
+    while True:
+        wait_for_host(host)
+        try:
+            return POOL.request(url, read_validators(url))
+        except FETCH_ERRORS as error:
+            attempt += 1
+            delay = backoff(url, error, attempt) if retry else None
+            if delay is None:
+                raise
+            time.sleep(delay)
+
+
+def fetch(url, ttls=None, retry=True):
+    """
+    Function:
+        Fetch page through the on-disk cache. Stale pages are revalidated
+        with a conditional GET, and a 304 keeps the cached copy. Offline
+        mode replays cached pages regardless of age. Raises one of
+        FETCH_ERRORS once retries are spent, or on the first failure when
+        retry is off and the caller retries itself.
+
+    Input:
+        url: str
+        ttls: dict(str: int), TTLs of this call over PAGE_TTLS
+        retry: bool
+
+    Output:
+        html: bytes
+    """
+    html = cached(url, ttls)
+    if html is not None:
+        return html
+
+    if OFFLINE:
+        raise LookupError(f'{url} is not cached and offline mode is on')
+
+    # Connect, revalidating a stale copy when there is one
+    start = time.perf_counter()
+    status, html, headers = request(url, retry)
+    source = 'not_modified' if status == 304 else 'network'
+    METRICS.observe('fetch_seconds', time.perf_counter() - start, page_type=page_type(url), source=source)
+    METRICS.inc('fetch_bytes', len(html), page_type=page_type(url), source=source)
+
+    if status == 304:
+        os.utime(cache_path(url))
+        return read_cache(url, None)
+
+    write_cache(url, html)
+    write_validators(url, headers)
+
+    return html
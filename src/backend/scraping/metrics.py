@@ -0,0 +1,307 @@
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+# File metrics are written to at the end of a run. A path ending in .prom
+# is written in Prometheus text format, anything else as JSON lines.
+METRICS_PATH = os.environ.get('SCRAPE_METRICS')
+
+# Upper bounds of histogram buckets, in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class Metrics:
+    """
+    Class:
+        Counters and latency histograms keyed by name and labels. Safe to
+        share between the crawler's fetch threads. Parser processes keep
+        their own and ship them back with their rows, see merge.
+
+    Input:
+        buckets: tuple(float)
+    """
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counters = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        """
+        Function:
+            Add value to counter
+
+        Input:
+            name: str
+            value: float
+            labels: str
+
+        Output:
+            None
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """
+        Function:
+            Record value in histogram
+
+        Input:
+            name: str
+            value: float
+            labels: str
+
+        Output:
+            None
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {
+                    'counts': [0] * (len(self.buckets) + 1), 'count': 0, 'sum': 0.0, 'max': 0.0
+                }
+            histogram['counts'][bisect.bisect_left(self.buckets, value)] += 1
+            histogram['count'] += 1
+            histogram['sum'] += value
+            histogram['max'] = max(histogram['max'], value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """
+        Function:
+            Record seconds spent in the block in histogram
+
+        Input:
+            name: str
+            labels: str
+
+        Output:
+            None
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def drain(self):
+        """
+        Function:
+            Remove and return everything recorded, to ship it to another
+            process
+
+        Input:
+            None
+
+        Output:
+            snapshot: (dict, dict)
+        """
+        with self.lock:
+            snapshot = (self.counters, self.histograms)
+            self.counters, self.histograms = {}, {}
+
+        return snapshot
+
+    def merge(self, snapshot):
+        """
+        Function:
+            Add a drained snapshot to these metrics
+
+        Input:
+            snapshot: (dict, dict)
+
+        Output:
+            None
+        """
+        counters, histograms = snapshot
+        with self.lock:
+            for key, value in counters.items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            for key, other in histograms.items():
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    self.histograms[key] = {**other, 'counts': list(other['counts'])}
+                    continue
+                histogram['counts'] = [a + b for a, b in zip(histogram['counts'], other['counts'])]
+                histogram['count'] += other['count']
+                histogram['sum'] += other['sum']
+                histogram['max'] = max(histogram['max'], other['max'])
+
+    def quantile(self, histogram, q):
+        """
+        Function:
+            Upper bound of the bucket holding quantile q
+
+        Input:
+            histogram: dict
+            q: float
+
+        Output:
+            seconds: float
+        """
+        rank = q * histogram['count']
+        seen = 0
+        for bound, count in zip(self.buckets, histogram['counts']):
+            seen += count
+            if seen >= rank:
+                return bound
+
+        return histogram['max']
+
+    def records(self):
+        """
+        Function:
+            One record per counter and histogram series
+
+        Input:
+            None
+
+        Output:
+            records: list(dict)
+        """
+        with self.lock:
+            records = [
+                {'metric': name, 'type': 'counter', 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                records.append({
+                    'metric': name,
+                    'type': 'histogram',
+                    'labels': dict(labels),
+                    'count': histogram['count'],
+                    'sum': histogram['sum'],
+                    'max': histogram['max'],
+                    'buckets': dict(zip([str(bound) for bound in self.buckets] + ['+Inf'], histogram['counts']))
+                })
+
+        return records
+
+    def write_jsonl(self, path):
+        """
+        Function:
+            Write metrics as JSON lines
+
+        Input:
+            path: str
+
+        Output:
+            None
+        """
+        with open(path, 'w') as f:
+            for record in self.records():
+                f.write(json.dumps(record) + '\n')
+
+    def write_prometheus(self, path):
+        """
+        Function:
+            Write metrics in Prometheus text format
+
+        Input:
+            path: str
+
+        Output:
+            None
+        """
+        def label_text(labels):
+            if not labels:
+                return ''
+            return '{' + ','.join(f'{key}="{value}"' for key, value in labels.items()) + '}'
+
+        lines = []
+        typed = set()
+        for record in self.records():
+            name = f"scrape_{record['metric']}"
+            if record['type'] == 'counter':
+                name = f'{name}_total'
+            if name not in typed:
+                lines.append(f"# TYPE {name} {record['type']}")
+                typed.add(name)
+
+            labels = record['labels']
+            if record['type'] == 'counter':
+                lines.append(f"{name}{label_text(labels)} {record['value']}")
+                continue
+
+            cumulative = 0
+            for bound, count in record['buckets'].items():
+                cumulative += count
+                lines.append(f"{name}_bucket{label_text({**labels, 'le': bound})} {cumulative}")
+            lines.append(f"{name}_sum{label_text(labels)} {record['sum']}")
+            lines.append(f"{name}_count{label_text(labels)} {record['count']}")
+
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def write(self, path):
+        """
+        Function:
+            Write metrics, format picked by the file extension
+
+        Input:
+            path: str
+
+        Output:
+            None
+        """
+        if path.endswith('.prom'):
+            self.write_prometheus(path)
+        else:
+            self.write_jsonl(path)
+
+    def summary(self):
+        """
+        Function:
+            Text summary of every histogram and counter
+
+        Input:
+            None
+
+        Output:
+            summary: str
+        """
+        lines = [f"{'metric':<40}{'count':>10}{'total s':>10}{'mean ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+        with self.lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+        for (name, labels), histogram in histograms:
+            label = ','.join(str(label_value) for _, label_value in labels)
+            lines.append(
+                f"{f'{name}[{label}]':<40}{histogram['count']:>10}{histogram['sum']:>10.2f}"
+                f"{1000 * histogram['sum'] / histogram['count']:>10.1f}"
+                f"{1000 * self.quantile(histogram, 0.95):>10.1f}{1000 * histogram['max']:>10.1f}"
+            )
+        for (name, labels), value in counters:
+            label = ','.join(str(label_value) for _, label_value in labels)
+            lines.append(f"{f'{name}[{label}]':<40}{value:>10}")
+
+        return '\n'.join(lines)
+
+    def report(self, path=None):
+        """
+        Function:
+            Print the summary at the end of a run and write the metrics
+            file, if one is set
+
+        Input:
+            path: str, METRICS_PATH when None
+
+        Output:
+            None
+        """
+        print(self.summary())
+
+        path = path or METRICS_PATH
+        if path:
+            self.write(path)
+
+
+# Metrics of this process
+METRICS = Metrics()
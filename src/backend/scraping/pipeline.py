@@ -0,0 +1,134 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from backend.scraping.metrics import METRICS
+from backend.scraping.sink import TableSink
+
+
+def reset_metrics():
+    """
+    Function:
+        Start a parser process with empty metrics, dropping any copied
+        from the parent when it forked
+
+    Input:
+        None
+
+    Output:
+        None
+    """
+    METRICS.drain()
+
+
+def parse_rows(parse_game, html, game_info):
+    """
+    Function:
+        Worker side of the pipeline. Parse page into per-table row batches.
+
+    Input:
+        parse_game: function(html, game_info, sink)
+        html: bytes
+        game_info: dict(str: str)
+
+    Output:
+        batches: dict(str: dict(str: list))
+        metrics: (dict, dict), recorded while parsing
+    """
+    sink = TableSink()
+    parse_game(html, game_info, sink)
+
+    return sink.drain(), METRICS.drain()
+
+
+class ParsePool:
+    """
+    Class:
+        Parse stage decoupled from fetching. Pages queue up for a pool of
+        parser processes, and their row batches come back to one writer,
+        the sink, in the order pages were queued. At most max_pending
+        pages are queued or parsing, so memory stays bounded. With a
+        checkpoint, every game is committed before its rows reach the sink.
+
+    Input:
+        parse_game: function(html, game_info, sink)
+        sink: TableSink
+        workers: int
+        max_pending: int
+        checkpoint: Checkpoint
+    """
+    def __init__(self, parse_game, sink, workers=None, max_pending=None, checkpoint=None):
+        self.parse_game = parse_game
+        self.sink = sink
+        self.checkpoint = checkpoint
+        self.workers = workers or os.cpu_count()
+        self.max_pending = max_pending or 4 * self.workers
+        self.pending = deque()
+        self.executor = ProcessPoolExecutor(self.workers, initializer=reset_metrics)
+
+    def submit(self, html, game_info, sink=None):
+        """
+        Function:
+            Queue page for parsing. Blocks on the oldest page once the
+            queue is full. Matches the parse_game signature, so the pool
+            can stand in for it in the crawler.
+
+        Input:
+            html: bytes
+            game_info: dict(str: str)
+            sink: TableSink, ignored, rows go to the pool's sink
+
+        Output:
+            None
+        """
+        while len(self.pending) >= self.max_pending:
+            self.write(*self.pending.popleft())
+
+        self.pending.append((game_info, self.executor.submit(parse_rows, self.parse_game, html, game_info)))
+
+        # Write whatever already finished in order
+        while self.pending and self.pending[0][1].done():
+            self.write(*self.pending.popleft())
+
+    def write(self, game_info, future):
+        """
+        Function:
+            Append row batches of a parsed page to the sink
+
+        Input:
+            game_info: dict(str: str)
+            future: Future
+
+        Output:
+            None
+        """
+        batches, metrics = future.result()
+        METRICS.merge(metrics)
+        if self.checkpoint is not None:
+            self.checkpoint.commit(game_info, batches)
+
+        for table, columns in batches.items():
+            self.sink.append(table, columns)
+
+    def close(self):
+        """
+        Function:
+            Write every queued page and stop the workers
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        while self.pending:
+            self.write(*self.pending.popleft())
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.executor.shutdown(cancel_futures=True)
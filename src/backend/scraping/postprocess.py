@@ -0,0 +1,103 @@
+import pandas as pd
+
+
+# Play types counted in the play count tip, e.g. '5 Rush, 3 Pass, 1 Penalty'
+PLAY_TYPES = ['pass', 'rush', 'penalty']
+
+
+def clock_seconds(values):
+    """
+    Function:
+        Clock text, e.g. '5:52', in seconds
+
+    Input:
+        values: Series
+
+    Output:
+        seconds: Series
+    """
+    parts = values.astype('string').str.extract(r'^(\d+):(\d\d)$')
+
+    return (pd.to_numeric(parts[0]) * 60 + pd.to_numeric(parts[1])).astype('Int16')
+
+
+def process_drives(df):
+    """
+    Function:
+        Expand raw drive columns of many games at once:
+            ~ play_types tip into pass, rush and penalty counts
+            ~ time_start and time_total into seconds
+            ~ start_at, e.g. 'DAL 25' or '50', into start_side and start_yard
+        Frames without the raw play_types column are already processed
+        and returned unchanged.
+
+    Input:
+        df: DataFrame
+
+    Output:
+        df: DataFrame
+    """
+    if 'play_types' not in df:
+        return df
+
+    tips = df.pop('play_types').astype('string')
+    for play in PLAY_TYPES:
+        counts = tips.str.extract(rf'(\d+) {play.capitalize()}', expand=False)
+        df[play] = pd.to_numeric(counts).fillna(0).astype('Int16')
+
+    for column in ['time_start', 'time_total']:
+        if column in df:
+            df[column] = clock_seconds(df[column])
+
+    # Midfield has no side, e.g. '50'
+    if 'start_at' in df:
+        start = df['start_at'].astype('string').str.extract(r'^(?:(\S+) )?(\d+)$')
+        df['start_side'] = start[0]
+        df['start_yard'] = pd.to_numeric(start[1]).astype('Int16')
+
+    return df
+
+
+def process_scoring(df):
+    """
+    Function:
+        Fill the quarter of every scoring play from the play before it in
+        the same game. The page lists it only on the first play of each
+        quarter.
+
+    Input:
+        df: DataFrame
+
+    Output:
+        df: DataFrame
+    """
+    if 'quarter' in df:
+        quarter = df['quarter'].replace('', None)
+        df['quarter'] = quarter.groupby([df['season'], df['week'], df['home']], sort=False).ffill()
+
+    return df
+
+
+# Table -> function run on every chunk of raw rows before it is typed
+POSTPROCESS = {
+    'drives': process_drives,
+    'scoring': process_scoring
+}
+
+
+def postprocess(table, df):
+    """
+    Function:
+        Run the post-processing stage of table, if it has one
+
+    Input:
+        table: str
+        df: DataFrame
+
+    Output:
+        df: DataFrame
+    """
+    if table in POSTPROCESS:
+        return POSTPROCESS[table](df)
+
+    return df
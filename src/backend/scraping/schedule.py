@@ -1,109 +1,159 @@
-import pandas as pd
-from bs4 import BeautifulSoup, Comment
-from urllib.request import urlopen
+from datetime import datetime
+from functools import partial
+from backend.scraping import engine
+from backend.scraping.crawler import crawl, page_url, week_number
+from backend.scraping.fetch import fetch
+from backend.scraping.metrics import METRICS
+from backend.scraping.sink import TableSink
+from backend.scraping.tables import cell_text, parse_html
 
 
-def scrape_game(game_info, dfs):
+# Outputs filled from each boxscore
+TABLES = ['schedule']
+
+# Parse boxscore page of game into TABLES, for games the week page leaves undated
+parse_game = engine.parser(TABLES)
+
+
+def schedule_date(text):
     """
-    Function: 
-        Scrapes schdeule
-        Writes following DataFrames to CSV files:
-            ~ scores
+    Function:
+        Week page date in the scorebox format, e.g. 'Sep 12, 2021' to
+        'Sunday Sep 12, 2021'
 
     Input:
-        game_info: dict(
-            str: str, 
-            str: str, 
-            str: str, 
-            str: str,
-            str: str, 
-            str: str
-        )
-        dfs: dict(str: DataFrame)
+        text: str
 
     Output:
-        None
+        date: str, None when text is not a date
     """
-    # Connect
-    url = f"https://www.pro-football-reference.com{game_info['href']}"
-    html = urlopen(url)
-    soup = BeautifulSoup(html, features="lxml")
+    try:
+        date = datetime.strptime(text.strip(), '%b %d, %Y')
+    except ValueError:
+        return None
+
+    return f'{date:%A} {date:%b} {date.day}, {date.year}'
+
+
+def parse_week(html, week, season):
+    """
+    Function:
+        Parse every game listed on week page, played or not
 
-    # Set tables
-    date = soup.find('div', attrs={'class': 'scorebox_meta'}).find('div').text
+    Input:
+        html: bytes
+        week: str
+        season: int
 
-    game_info['date'] = date
+    Output:
+        games: list(dict(
+            str: str,
+            str: str,
+            str: str,
+            str: str,
+            str: str,
+            str: str
+        ))
+    """
+    root = parse_html(html)
 
-    # Print matchup tp track progress
-    print(f"\t\t{game_info['away']} @ {game_info['home']}, {game_info['date'].strip()}")
+    # Iterate over each game
+    games = []
+    for game in root.xpath("//div[contains(@class, 'game_summaries')]//table[@class='teams']"):
+        rows = game.findall('.//tr')
+        link = rows[1].find(".//td[@class='right gamelink']/a")
+        games.append({
+            'date': cell_text(rows[0].find('td')).strip('\n'),
+            'week': week,
+            'season': season,
+            'away': cell_text(rows[1].find('td')),
+            'home': cell_text(rows[2].find('td')),
+            'href': link.get('href') if link is not None else None
+        })
 
-    dfs['schedule'] = dfs['schedule'].append(game_info, ignore_index=True)
+    return games
 
 
-def scrape_week(href, season, dfs):
+def schedule_week(html, week, season, sink):
     """
-    Function: 
-        Scrapes week schedule.
+    Function:
+        Append games dated on week page to schedule. Games without a date
+        are returned, their date is read from the boxscore.
+
+    Input:
+        html: bytes
+        week: str
+        season: int
+        sink: TableSink
+
+    Output:
+        undated: list(dict(
+            str: str,
+            str: str,
+            str: str,
+            str: str,
+            str: str,
+            str: str
+        ))
+    """
+    undated = []
+    for game_info in parse_week(html, week, season):
+        date = schedule_date(game_info['date'])
+        if date is None:
+            if game_info['href'] is not None:
+                undated.append(game_info)
+            continue
+
+        sink.append('schedule', {
+            'week': [week],
+            'season': [season],
+            'away': [game_info['away']],
+            'home': [game_info['home']],
+            'href': [game_info['href']],
+            'date': [date]
+        })
+
+    return undated
+
+
+def scrape_week(href, season, sink):
+    """
+    Function:
+        Scrapes week schedule from week page
         Writes following DataFrames to CSV files:
             ~ schedule
 
     Input:
         href: str
         season: int
-        dfs: dict(str: DataFrame)
+        sink: TableSink
 
     Output:
         None
     """
     # Print week to track progress
-    week = href.split('/')[-1].split('_')[-1].split('.')[0]
+    week = week_number(href)
     print(f'\tWeek: {week}')
-    
-    # Connect
-    url = f'https://www.pro-football-reference.com{href}'
-    html = urlopen(url)
-    soup = BeautifulSoup(html, features="lxml")
-
-    # Iterate over each game
-    games = soup.find('div', attrs={'class': 'game_summaries'}).find_all('div')
-    for game in games:
-        game_info = {
-            'week': week,
-
-            'season': season,
-
-            'away': game.find(
-                'table', 
-                attrs={'class': 'teams'}
-            ).find_all('tr')[1].find('td').text,
 
-            'home': game.find(
-                'table', 
-                attrs={'class': 'teams'}
-            ).find_all('tr')[2].find('td').text,
-
-            'href': game.find(
-                'table', 
-                attrs={'class': 'teams'}
-            ).find_all('tr')[1].find(
-                'td', 
-                attrs={'class': 'right gamelink'}
-            ).find('a')['href']
-        }
+    # Connect
+    url = page_url(href)
+    html = fetch(url)
 
-        scrape_game(game_info, dfs)
+    # Boxscores only for games the week page leaves undated
+    for game_info in schedule_week(html, week, season, sink):
+        engine.scrape_game(game_info, sink, TABLES)
 
 
-def scrape_season(season, dfs):
+def scrape_season(season, sink):
     """
-    Function: 
+    Function:
         Scrapes season schedules since 2010.
         Writes following DataFrames to CSV files:
             ~ schedule
 
     Input:
         season: int
-        dfs: dict(str: DataFrame)
+        sink: TableSink
 
     Output:
         None
@@ -112,42 +162,39 @@ def scrape_season(season, dfs):
     print(f'Season: {season}')
 
     # Connect
-    url = f'https://www.pro-football-reference.com/years/{season}/'
-    html = urlopen(url)
-    soup = BeautifulSoup(html, features="lxml")
-    
-    # Week links
-    week_hrefs = {a['href'] for a in soup.find_all('a') if '/week_' in a['href']}
+    url = page_url(f'/years/{season}/')
+    html = fetch(url)
 
     # Iterate of each week
-    for href in week_hrefs:
-        scrape_week(href, season, dfs)
+    for href in engine.parse_season(html):
+        scrape_week(href, season, sink)
 
 
 def main():
     """
     Function:
-        Scrapes season schedules since 2010.
+        Scrapes season schedules since 2010 from season and week pages.
+        A boxscore is fetched only for a game its week page leaves undated.
         Writes following DataFrames to CSV files:
             ~ schedule
 
     Input:
         None
-        
+
     Output:
         None
     """
-    # Initialize DataFrames
-    dfs = {'schedule': pd.DataFrame()}
+    sink = TableSink(TABLES)
+
+    # Crawl seasons concurrently, week pages fill the schedule
+    crawl(range(2010, 2023), engine.parse_season, partial(schedule_week, sink=sink), parse_game, sink)
 
-    # Iterate over each season
-    for season in range(2010, 2023):
-        scrape_season(season, dfs) # Append season to data structure
+    # Where the crawl spent its time
+    METRICS.report()
 
     # Write DataFrames to CSV files
-    for df in dfs:
-        dfs[df].to_csv(f'backend/data/games/{df}.csv', index=False)
+    engine.write_tables(sink)
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,377 @@
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+
+# Kinds of column every games table starts with
+COMMON = {
+    'date': 'date',
+    'week': 'int16',
+    'season': 'int16',
+    'team': 'category',
+    'opponent': 'category',
+    'home_field': 'bool'
+}
+
+# Kind of every column the schemas leave out, e.g. pass_yds or tackles_solo
+COUNT = 'int16'
+
+# Columns of each table that are not int16 counts. Every column left out
+# is an int16 count.
+SCHEMAS = {
+    'scores': {
+        **COMMON,
+        '3_straight': 'bool',
+        'first_score_team': 'category',
+        'first_score_quarter': 'category',
+        'first_score_time': 'clock'
+    },
+    'scoring': {
+        **COMMON,
+        'away': 'category',
+        'home': 'category',
+        'quarter': 'category',
+        'time': 'clock',
+        'description': 'string'
+    },
+    'team_stats': {
+        **COMMON,
+        'poss': 'clock'
+    },
+    'player_offense': {
+        **COMMON,
+        'player': 'category',
+        'pass_rating': 'float32',
+        'pass_yds_per_att': 'float32',
+        'rush_yds_per_att': 'float32',
+        'rec_yds_per_rec': 'float32'
+    },
+    'player_defense': {
+        **COMMON,
+        'player': 'category',
+        'sacks': 'float32'
+    },
+    'returns': {
+        **COMMON,
+        'player': 'category',
+        'kick_ret_yds_per_ret': 'float32',
+        'punt_ret_yds_per_ret': 'float32'
+    },
+    'kicking': {
+        **COMMON,
+        'player': 'category',
+        'punt_yds_per_punt': 'float32'
+    },
+    'starters': {
+        **COMMON,
+        'player': 'category',
+        'pos': 'category'
+    },
+    'drives': {
+        **COMMON,
+        'quarter': 'category',
+        'time_start': 'clock',
+        'start_at': 'category',
+        'start_side': 'category',
+        'time_total': 'clock',
+        'end_event': 'category'
+    },
+    'schedule': {
+        'week': 'int16',
+        'season': 'int16',
+        'away': 'category',
+        'home': 'category',
+        'href': 'string',
+        'date': 'weekday_date'
+    }
+}
+
+# strptime formats of date kinds
+DATE_FORMATS = {
+    'date': '%b %d, %Y',
+    'weekday_date': '%A %b %d, %Y'
+}
+
+# Pandas dtype of each kind. A column always gets the dtype of its kind,
+# whatever the values of a chunk, so chunks and segments line up.
+DTYPES = {
+    'int16': 'Int16',
+    'float32': 'float32',
+    'clock': 'Int16',
+    'bool': 'boolean',
+    'category': 'category',
+    'string': 'string',
+    'date': 'datetime64[ns]',
+    'weekday_date': 'datetime64[ns]'
+}
+
+# Text of bool cells, as read back from CSV
+BOOLS = {'True': True, 'False': False}
+
+
+def dtypes(table, columns):
+    """
+    Function:
+        Declared dtype of each column of table
+
+    Input:
+        table: str
+        columns: iterable(str)
+
+    Output:
+        dtypes: dict(str: str)
+    """
+    schema = SCHEMAS.get(table, {})
+
+    return {column: DTYPES[schema.get(column, COUNT)] for column in columns}
+
+
+def missing(values):
+    """
+    Function:
+        Text column with empty cells as missing values
+
+    Input:
+        values: Series
+
+    Output:
+        values: Series
+    """
+    if values.dtype == object or pd.api.types.is_string_dtype(values):
+        return values.replace('', None)
+
+    return values
+
+
+def to_number(values, kind):
+    """
+    Function:
+        Numeric column of kind. Counts are nullable int16, and a value
+        that is fractional or does not fit raises.
+
+    Input:
+        values: Series
+        kind: str, int16 or float32
+
+    Output:
+        values: Series
+    """
+    return pd.to_numeric(missing(values)).astype(DTYPES[kind])
+
+
+def to_date(values, kind):
+    """
+    Function:
+        Parse date column
+
+    Input:
+        values: Series
+        kind: str, date or weekday_date
+
+    Output:
+        values: Series
+    """
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(missing(values), format=DATE_FORMATS[kind])
+
+    return values.astype(DTYPES[kind])
+
+
+def to_clock(values):
+    """
+    Function:
+        Game clock or time of possession, e.g. '32:56', in seconds
+
+    Input:
+        values: Series
+
+    Output:
+        values: Series
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(DTYPES['clock'])
+
+    values = missing(values)
+    parts = values.str.extract(r'^(\d+):(\d\d)$')
+    if (parts[0].isna() & values.notna()).any():
+        raise ValueError('not a clock')
+
+    return (pd.to_numeric(parts[0]) * 60 + pd.to_numeric(parts[1])).astype(DTYPES['clock'])
+
+
+def to_bool(values):
+    """
+    Function:
+        Bool column, from bools or their text
+
+    Input:
+        values: Series
+
+    Output:
+        values: Series
+    """
+    if values.dtype == object or pd.api.types.is_string_dtype(values):
+        values = missing(values).map(lambda value: BOOLS.get(value, value) if isinstance(value, str) else value)
+
+    return values.astype(DTYPES['bool'])
+
+
+def to_category(values):
+    """
+    Function:
+        Category column of text values, so codes read back from CSV as
+        numbers, e.g. quarters, share categories with scraped ones
+
+    Input:
+        values: Series
+
+    Output:
+        values: Series
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(values.cat.categories.dtype)
+    if pd.api.types.is_float_dtype(values) and (values.dropna() == values.dropna().round()).all():
+        values = values.astype('Int64')
+
+    return missing(values.astype('string')).astype(object).astype(DTYPES['category'])
+
+
+def convert(values, kind):
+    """
+    Function:
+        Convert column to the dtype of kind
+
+    Input:
+        values: Series
+        kind: str
+
+    Output:
+        values: Series
+    """
+    if kind in ('int16', 'float32'):
+        return to_number(values, kind)
+    if kind in DATE_FORMATS:
+        return to_date(values, kind)
+    if kind == 'clock':
+        return to_clock(values)
+    if kind == 'bool':
+        return to_bool(values)
+    if kind == 'category':
+        return to_category(values)
+
+    return missing(values).astype(DTYPES[kind])
+
+
+def apply_schema(table, df):
+    """
+    Function:
+        Convert columns of table to their declared dtypes. Columns the
+        schema leaves out are int16 counts. Every chunk of a table gets
+        the same dtypes, and values that do not fit raise rather than
+        widening the column.
+
+    Input:
+        table: str
+        df: DataFrame
+
+    Output:
+        df: DataFrame
+    """
+    schema = SCHEMAS.get(table, {})
+    columns = {}
+    for column in df.columns:
+        kind = schema.get(column, COUNT)
+        try:
+            columns[column] = convert(df[column], kind)
+        except (AttributeError, ValueError, TypeError) as error:
+            raise ValueError(f'{table}.{column}: values do not fit {kind}, declare it in SCHEMAS: {error}') from error
+
+    return pd.DataFrame(columns, index=df.index)
+
+
+def concat(frames):
+    """
+    Function:
+        Concatenate typed frames, merging the categories of categorical
+        columns so they stay categorical
+
+    Input:
+        frames: list(DataFrame)
+
+    Output:
+        df: DataFrame
+    """
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+
+    categorical = [
+        column for column in frames[0].columns
+        if all(column in df and isinstance(df[column].dtype, pd.CategoricalDtype) for df in frames)
+    ]
+    df = pd.concat(frames, ignore_index=True)
+    for column in categorical:
+        try:
+            df[column] = union_categoricals([frame[column] for frame in frames], ignore_order=True)
+        except TypeError:
+            # Categories of different types, e.g. a chunk with no values
+            df[column] = df[column].astype('category')
+
+    return df
+
+
+def to_text(table, df):
+    """
+    Function:
+        Frame as written to CSV. Dates, clocks and float32 stats go back
+        to the page format, so typed and untyped tables write the same text.
+
+    Input:
+        table: str
+        df: DataFrame
+
+    Output:
+        df: DataFrame
+    """
+    schema = SCHEMAS.get(table, {})
+    df = df.copy()
+    for column in df.columns:
+        values = df[column]
+        kind = schema.get(column)
+        if kind in DATE_FORMATS and pd.api.types.is_datetime64_any_dtype(values):
+            before, after = DATE_FORMATS[kind].split('%d')
+            text = values.dt.strftime(before) + values.dt.day.astype('string') + values.dt.strftime(after)
+            df[column] = text.astype(object)
+        elif kind == 'float32' and pd.api.types.is_float_dtype(values):
+            # Shortest text of the float32 value, whole numbers without '.0' like the page, e.g. 47 sacks
+            df[column] = values.astype('string').str.replace(r'\.0$', '', regex=True).astype(object)
+        elif kind == 'clock' and pd.api.types.is_integer_dtype(values):
+            minutes = (values // 60).astype('string')
+            seconds = (values % 60).astype('string').str.zfill(2)
+            df[column] = (minutes + ':' + seconds).astype(object)
+
+    return df
+
+
+def memory_report(raw, typed):
+    """
+    Function:
+        Memory held by each table before and after typing
+
+    Input:
+        raw: dict(str: DataFrame)
+        typed: dict(str: DataFrame)
+
+    Output:
+        report: DataFrame
+    """
+    report = pd.DataFrame({
+        'rows': [len(raw[table]) for table in raw],
+        'raw_bytes': [int(raw[table].memory_usage(deep=True).sum()) for table in raw],
+        'typed_bytes': [int(typed[table].memory_usage(deep=True).sum()) for table in raw]
+    }, index=list(raw))
+    report.loc['total'] = report.sum()
+    report['reduction'] = 1 - report['typed_bytes'] / report['raw_bytes']
+
+    return report
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+from backend.scraping.store import STORE_DIR
+
+
+# Boxscores in the store, beside the tables they were parsed into
+SEEN_FILE = '_seen.json'
+
+
+def page_hash(html):
+    """
+    Function:
+        Content hash of page
+
+    Input:
+        html: bytes
+
+    Output:
+        digest: str
+    """
+    return hashlib.sha256(html).hexdigest()
+
+
+def game_key(season, week, team, opponent):
+    """
+    Function:
+        Key of a game from either side of it
+
+    Input:
+        season: int
+        week: int
+        team: str
+        opponent: str
+
+    Output:
+        key: (int, int, frozenset(str))
+    """
+    return int(season), int(week), frozenset((team, opponent))
+
+
+class SeenIndex:
+    """
+    Class:
+        Persisted index of boxscores already in the store, by href, with
+        the content hash of the page they were parsed from. A crawl fetches
+        only games missing from it, and a fetched page is parsed only when
+        its hash is new. Games are recorded as they are parsed and written
+        by save once their rows are in the store.
+
+    Input:
+        store_dir: str
+    """
+    def __init__(self, store_dir=STORE_DIR):
+        self.path = os.path.join(store_dir, SEEN_FILE)
+        self.entries = {}
+        self.pending = {}
+        self.changed = []
+
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.entries = json.load(f)
+
+    def __contains__(self, href):
+        return href in self.entries or href in self.pending
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, game_info, digest):
+        """
+        Function:
+            Record game as parsed from a page with hash digest
+
+        Input:
+            game_info: dict(str: str)
+            digest: str, None when the page was never hashed
+
+        Output:
+            None
+        """
+        self.pending[game_info['href']] = {
+            'season': int(game_info['season']),
+            'week': int(game_info['week']),
+            'away': game_info['away'],
+            'home': game_info['home'],
+            'hash': digest
+        }
+
+    def clear(self):
+        """
+        Function:
+            Forget every game, for a rebuild that replaces the whole store
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        self.entries = {}
+        self.pending = {}
+        self.changed = []
+
+    def seed(self, game_info):
+        """
+        Function:
+            Record game found in the store by its teams, from before the
+            index was kept. Its page is hashed the next time it is parsed.
+
+        Input:
+            game_info: dict(str: str)
+
+        Output:
+            None
+        """
+        if game_info['href'] not in self:
+            self.add(game_info, None)
+
+    def parser(self, parse_game):
+        """
+        Function:
+            Wrap parse_game to skip pages whose hash is already indexed.
+            Games parsed again from a changed page are kept in changed, so
+            their old rows can be dropped.
+
+        Input:
+            parse_game: function(html, game_info, sink)
+
+        Output:
+            parse: function(html, game_info, sink)
+        """
+        def parse(html, game_info, sink):
+            digest = page_hash(html)
+            entry = self.pending.get(game_info['href']) or self.entries.get(game_info['href'])
+            if entry is not None and entry['hash'] == digest:
+                return
+
+            parse_game(html, game_info, sink)
+            if entry is not None:
+                self.changed.append(game_info)
+            self.add(game_info, digest)
+
+        return parse
+
+    def save(self):
+        """
+        Function:
+            Commit recorded games, once their rows are in the store
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        self.entries.update(self.pending)
+        self.pending = {}
+        self.changed = []
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
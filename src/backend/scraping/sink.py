@@ -0,0 +1,284 @@
+import os
+import shutil
+import tempfile
+import pandas as pd
+from backend.scraping.metrics import METRICS
+from backend.scraping.postprocess import postprocess
+from backend.scraping.schema import apply_schema, concat
+
+
+# Buffered rows per table before they are built into a DataFrame chunk
+CHUNK_SIZE = 50000
+
+
+class TableSink:
+    """
+    Class:
+        Row buffer for scraped tables. Rows are appended to per-column
+        lists and built into a DataFrame once per chunk, so adding a game
+        costs the same no matter how many rows are already held. A typed
+        sink converts each chunk by its table's schema as the chunk is
+        built, so text cells are only held until the chunk fills. Raw
+        columns of a chunk are post-processed first, e.g. drive tips.
+
+    Input:
+        tables: list(str)
+        chunk_size: int
+        typed: bool
+    """
+    def __init__(self, tables=(), chunk_size=CHUNK_SIZE, typed=False):
+        self.chunk_size = chunk_size
+        self.typed = typed
+        self.appended = {}
+        self.columns = {}
+        self.rows = {}
+        self.chunks = {}
+        for table in tables:
+            self.add_table(table)
+
+    def add_table(self, table):
+        """
+        Function:
+            Register empty table
+
+        Input:
+            table: str
+
+        Output:
+            None
+        """
+        if table not in self.columns:
+            self.columns[table] = {}
+            self.rows[table] = 0
+            self.chunks[table] = []
+
+    def append(self, table, df):
+        """
+        Function:
+            Append rows to table. Columns missing on either side are
+            filled with None, like DataFrame.append.
+
+        Input:
+            table: str
+            df: dict(str: list) or DataFrame
+
+        Output:
+            None
+        """
+        self.add_table(table)
+
+        # Whole frames become a chunk of their own
+        if isinstance(df, pd.DataFrame):
+            self.appended[table] = self.appended.get(table, 0) + len(df)
+            self.flush(table)
+            if not df.empty:
+                df = postprocess(table, df)
+                self.chunks[table].append(apply_schema(table, df) if self.typed else df)
+            return
+
+        lengths = {len(values) for values in df.values()}
+        if len(lengths) > 1:
+            raise ValueError(f'{table}: columns have different lengths {sorted(lengths)}')
+        n = lengths.pop() if lengths else 0
+        if n == 0:
+            return
+
+        columns = self.columns[table]
+        rows = self.rows[table]
+        for column, values in df.items():
+            if column not in columns:
+                columns[column] = [None] * rows
+            columns[column].extend(values)
+        for column, values in columns.items():
+            if column not in df:
+                values.extend([None] * n)
+
+        self.rows[table] += n
+        self.appended[table] = self.appended.get(table, 0) + n
+        if self.rows[table] >= self.chunk_size:
+            self.flush(table)
+
+    def flush(self, table):
+        """
+        Function:
+            Build buffered rows of table into a DataFrame chunk
+
+        Input:
+            table: str
+
+        Output:
+            None
+        """
+        if self.rows.get(table):
+            with METRICS.timer('sink_flush_seconds', table=table):
+                df = postprocess(table, pd.DataFrame(self.columns[table]))
+                self.chunks[table].append(apply_schema(table, df) if self.typed else df)
+            self.columns[table] = {}
+            self.rows[table] = 0
+
+    def drain(self):
+        """
+        Function:
+            Remove and return the buffered rows of every table, to
+            ship rows from one sink to another
+
+        Input:
+            None
+
+        Output:
+            batches: dict(str: dict(str: list))
+        """
+        batches = {table: columns for table, columns in self.columns.items() if self.rows[table]}
+        for table in batches:
+            self.columns[table] = {}
+            self.rows[table] = 0
+
+        return batches
+
+    def frame(self, table):
+        """
+        Function:
+            DataFrame of every row appended to table
+
+        Input:
+            table: str
+
+        Output:
+            df: DataFrame
+        """
+        self.add_table(table)
+        self.flush(table)
+
+        chunks = self.chunks[table]
+        if not chunks:
+            return pd.DataFrame()
+        if len(chunks) > 1:
+            chunks[:] = [concat(chunks) if self.typed else pd.concat(chunks, ignore_index=True)]
+
+        return chunks[0]
+
+    def __getitem__(self, table):
+        return self.frame(table)
+
+    def __iter__(self):
+        return iter(list(self.columns))
+
+
+class StreamingSink(TableSink):
+    """
+    Class:
+        Typed sink whose memory stays flat however many seasons are
+        scraped. A table's buffered rows are built into a chunk whenever
+        a new week starts or chunk_size rows are held, and every chunk is
+        spilled to disk. frames reads the chunks back one at a time, typed
+        as they would be in the concatenated table, so writing them one
+        after another gives the same file as writing the whole table.
+
+    Input:
+        tables: list(str)
+        directory: str, spill directory, a temporary one when None
+        chunk_size: int
+    """
+    def __init__(self, tables=(), directory=None, chunk_size=CHUNK_SIZE):
+        self.directory = directory or tempfile.mkdtemp(prefix='sink-')
+        self.weeks = {}
+        self.spilled = {}
+        self.heads = {}
+        super().__init__(tables, chunk_size, typed=True)
+
+    def append(self, table, df):
+        """
+        Function:
+            Append rows to table, first building the buffered rows into a
+            chunk when they belong to another week
+
+        Input:
+            table: str
+            df: dict(str: list) or DataFrame
+
+        Output:
+            None
+        """
+        if 'season' in df and 'week' in df and len(df['week']):
+            week = (list(df['season'][:1]), list(df['week'][:1]))
+            if self.weeks.get(table, week) != week:
+                self.flush(table)
+            self.weeks[table] = week
+
+        super().append(table, df)
+
+    def flush(self, table):
+        """
+        Function:
+            Build buffered rows of table into a chunk and spill every held
+            chunk to disk
+
+        Input:
+            table: str
+
+        Output:
+            None
+        """
+        super().flush(table)
+
+        for df in self.chunks.get(table, []):
+            paths = self.spilled.setdefault(table, [])
+            path = os.path.join(self.directory, f'{table}-{len(paths):05d}.pkl')
+            df.to_pickle(path)
+            paths.append(path)
+
+            # One row per distinct set of column dtypes is enough to type the table
+            dtypes = tuple((column, str(dtype)) for column, dtype in df.dtypes.items())
+            self.heads.setdefault(table, {}).setdefault(dtypes, df.head(1).copy())
+        if table in self.chunks:
+            self.chunks[table] = []
+
+    def frames(self, table):
+        """
+        Function:
+            Chunks of table read back one at a time, typed as in the
+            concatenated table
+
+        Input:
+            table: str
+
+        Output:
+            frames: generator(DataFrame)
+        """
+        self.add_table(table)
+        self.flush(table)
+
+        # A row of every kind of chunk settles the dtypes of the whole table
+        probe = concat(list(self.heads.get(table, {}).values()))
+        for path in self.spilled.get(table, []):
+            df = pd.read_pickle(path)
+            yield concat([probe, df]).iloc[len(probe):].reset_index(drop=True)
+
+    def frame(self, table):
+        """
+        Function:
+            DataFrame of every row appended to table. Holds the whole
+            table in memory, frames does not.
+
+        Input:
+            table: str
+
+        Output:
+            df: DataFrame
+        """
+        return concat(list(self.frames(table)))
+
+    def close(self):
+        """
+        Function:
+            Remove the spilled chunks
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.spilled = {}
+        self.heads = {}
@@ -0,0 +1,360 @@
+import json
+import os
+import re
+import shutil
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from backend.scraping.schema import apply_schema, concat, dtypes
+
+
+# Root of the partitioned games store
+STORE_DIR = 'backend/data/games/store'
+
+# Partition directory names, e.g. season=2021/week=3
+PARTITION = re.compile(r'^(season|week)=(-?\d+)$')
+
+# Segment files of a partition, e.g. part-00000.parquet
+SEGMENT = re.compile(r'^part-(\d+)\.parquet$')
+
+# Sidecar with the latest season and week of every table
+META_FILE = '_meta.json'
+
+
+def partition_path(table, season, week, store_dir=STORE_DIR):
+    """
+    Function:
+        Directory of season/week partition of table
+
+    Input:
+        table: str
+        season: int
+        week: int
+        store_dir: str
+
+    Output:
+        path: str
+    """
+    return os.path.join(store_dir, table, f'season={int(season)}', f'week={int(week)}')
+
+
+def segments(path):
+    """
+    Function:
+        Segment numbers of partition, in write order
+
+    Input:
+        path: str
+
+    Output:
+        segments: list(int)
+    """
+    if not os.path.isdir(path):
+        return []
+
+    return sorted(int(match.group(1)) for match in map(SEGMENT.match, os.listdir(path)) if match)
+
+
+def write_segment(df, path, segment):
+    """
+    Function:
+        Write rows of df as a segment of partition. The file is written
+        aside and moved in place, so readers never see half a segment.
+
+    Input:
+        df: DataFrame
+        path: str
+        segment: int
+
+    Output:
+        None
+    """
+    os.makedirs(path, exist_ok=True)
+    target = os.path.join(path, f'part-{segment:05d}.parquet')
+    tmp = f'{target}.{os.getpid()}.tmp'
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp)
+    os.replace(tmp, target)
+
+
+def write_partition(df, path):
+    """
+    Function:
+        Replace partition with rows of df
+
+    Input:
+        df: DataFrame
+        path: str
+
+    Output:
+        None
+    """
+    old = segments(path)
+    write_segment(df, path, 0)
+    for segment in old:
+        if segment != 0:
+            os.remove(os.path.join(path, f'part-{segment:05d}.parquet'))
+
+
+def write_table(table, df, store_dir=STORE_DIR):
+    """
+    Function:
+        Write table to the store, one Parquet partition per season and
+        week. Columns are typed by the table's schema. Partitions present
+        in df are replaced, others are kept.
+
+    Input:
+        table: str
+        df: DataFrame
+        store_dir: str
+
+    Output:
+        None
+    """
+    df = apply_schema(table, df)
+    for (season, week), partition in df.groupby(['season', 'week'], sort=False):
+        write_partition(partition, partition_path(table, season, week, store_dir))
+    update_meta(table, df, store_dir)
+
+
+def append_table(table, df, store_dir=STORE_DIR):
+    """
+    Function:
+        Append rows to the store without touching what is already there.
+        Rows of each season and week become a new segment of their
+        partition, so the cost follows the size of the update.
+
+    Input:
+        table: str
+        df: DataFrame
+        store_dir: str
+
+    Output:
+        None
+    """
+    df = apply_schema(table, df)
+    for (season, week), partition in df.groupby(['season', 'week'], sort=False):
+        path = partition_path(table, season, week, store_dir)
+        write_segment(partition, path, max(segments(path), default=-1) + 1)
+    update_meta(table, df, store_dir)
+
+
+def drop_rows(table, season, week, keep, store_dir=STORE_DIR):
+    """
+    Function:
+        Rewrite season/week partition of table with only the rows keep
+        selects. A partition left empty is removed.
+
+    Input:
+        table: str
+        season: int
+        week: int
+        keep: function(DataFrame) -> boolean Series
+        store_dir: str
+
+    Output:
+        None
+    """
+    path = partition_path(table, season, week, store_dir)
+    if not segments(path):
+        return
+
+    df = read_table(table, seasons=[season], weeks=[week], store_dir=store_dir)
+    df = df[keep(df)]
+    if df.empty:
+        shutil.rmtree(path)
+    else:
+        write_partition(df.reset_index(drop=True), path)
+
+
+def read_meta(store_dir=STORE_DIR):
+    """
+    Function:
+        Latest season and week of every table
+
+    Input:
+        store_dir: str
+
+    Output:
+        meta: dict(str: dict(str: int))
+    """
+    path = os.path.join(store_dir, META_FILE)
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def update_meta(table, df, store_dir=STORE_DIR):
+    """
+    Function:
+        Move latest season and week of table forward to the rows of df
+
+    Input:
+        table: str
+        df: DataFrame
+        store_dir: str
+
+    Output:
+        None
+    """
+    if df.empty:
+        return
+
+    meta = read_meta(store_dir)
+    season = int(df['season'].max())
+    week = int(df.loc[df['season'] == season, 'week'].max())
+    entry = meta.get(table)
+    if entry is None or (season, week) > (entry['season'], entry['week']):
+        meta[table] = {'season': season, 'week': week}
+
+    os.makedirs(store_dir, exist_ok=True)
+    path = os.path.join(store_dir, META_FILE)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(meta, f, indent=4, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def latest(table, store_dir=STORE_DIR):
+    """
+    Function:
+        Latest season and week stored for table, read from the sidecar
+
+    Input:
+        table: str
+        store_dir: str
+
+    Output:
+        season: int, None when table is empty
+        week: int, None when table is empty
+    """
+    entry = read_meta(store_dir).get(table)
+    if entry is None:
+        return None, None
+
+    return entry['season'], entry['week']
+
+
+def partitions(table, seasons=None, weeks=None, store_dir=STORE_DIR):
+    """
+    Function:
+        Files of table in the wanted seasons and weeks. Partitions are
+        pruned by directory name, so no other file is opened.
+
+    Input:
+        table: str
+        seasons: iterable(int), every season when None
+        weeks: iterable(int), every week when None
+        store_dir: str
+
+    Output:
+        files: list(str), in season and week order
+    """
+    seasons = None if seasons is None else {int(season) for season in seasons}
+    weeks = None if weeks is None else {int(week) for week in weeks}
+
+    def keys(path):
+        keys = {}
+        for name in os.listdir(path):
+            match = PARTITION.match(name)
+            if match:
+                keys[int(match.group(2))] = os.path.join(path, name)
+        return sorted(keys.items())
+
+    root = os.path.join(store_dir, table)
+    if not os.path.isdir(root):
+        return []
+
+    files = []
+    for season, season_path in keys(root):
+        if seasons is not None and season not in seasons:
+            continue
+        for week, week_path in keys(season_path):
+            if weeks is not None and week not in weeks:
+                continue
+            files.extend(os.path.join(week_path, f'part-{segment:05d}.parquet') for segment in segments(week_path))
+
+    return files
+
+
+def read_table(table, columns=None, seasons=None, weeks=None, store_dir=STORE_DIR):
+    """
+    Function:
+        Read table from the store. Only partitions of the wanted seasons
+        and weeks are opened, and only the wanted columns are decoded.
+        Columns missing from some segments are read as missing values
+        of their declared dtype.
+
+    Input:
+        table: str
+        columns: list(str), every column when None
+        seasons: iterable(int), every season when None
+        weeks: iterable(int), every week when None
+        store_dir: str
+
+    Output:
+        df: DataFrame
+    """
+    frames = []
+    for path in partitions(table, seasons, weeks, store_dir):
+        if columns is None:
+            frames.append(pq.read_table(path).to_pandas())
+            continue
+
+        # Segments written before a column first appeared do not have it
+        names = pq.read_schema(path).names
+        df = pq.read_table(path, columns=[column for column in columns if column in names]).to_pandas()
+        frames.append(df.reindex(columns=columns))
+    if not frames:
+        return pd.DataFrame(columns=columns)
+
+    df = concat(frames)
+
+    return df.astype(dtypes(table, df.columns))
+
+
+def tables(store_dir=STORE_DIR):
+    """
+    Function:
+        Tables held in the store
+
+    Input:
+        store_dir: str
+
+    Output:
+        tables: list(str)
+    """
+    if not os.path.isdir(store_dir):
+        return []
+
+    return sorted(name for name in os.listdir(store_dir) if os.path.isdir(os.path.join(store_dir, name)))
+
+
+def main():
+    """
+    Function:
+        Load games tables from their CSV files into the store. Tables
+        without a CSV file, e.g. scoring before it was scraped, are skipped.
+
+    Input:
+        None
+
+    Output:
+        None
+    """
+    tables = [
+        'scores', 'scoring', 'team_stats', 'player_offense', 'player_defense', 'returns', 'kicking', 'starters',
+        'drives'
+    ]
+    for table in tables:
+        # Scrapers older than the scoring table never wrote scoring.csv
+        path = f'backend/data/games/{table}.csv'
+        if not os.path.exists(path):
+            print(f'Skipping {table}, {path} does not exist')
+            continue
+        write_table(table, pd.read_csv(path))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+import lxml.html
+from lxml import etree
+
+
+# Pages are served as utf-8
+PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+# Tables of a boxscore page, matched by id or by class. Elements other
+# than tables name their tag.
+BOXSCORE_TABLES = {
+    'scorebox_meta': {'tag': 'div', 'class': 'scorebox_meta'},
+    'linescore': {'class': 'linescore'},
+    'scoring': {'id': 'scoring'},
+    'team_stats': {'id': 'team_stats'},
+    'player_offense': {'id': 'player_offense'},
+    'player_defense': {'id': 'player_defense'},
+    'returns': {'id': 'returns'},
+    'kicking': {'id': 'kicking'},
+    'home_starters': {'id': 'home_starters'},
+    'vis_starters': {'id': 'vis_starters'},
+    'home_drives': {'id': 'home_drives'},
+    'vis_drives': {'id': 'vis_drives'}
+}
+
+
+def parse_html(html):
+    """
+    Function:
+        Parse page into an lxml tree
+
+    Input:
+        html: bytes
+
+    Output:
+        root: element
+    """
+    return lxml.html.fromstring(html, parser=PARSER)
+
+
+def marker(spec):
+    """
+    Function:
+        Text a comment must contain to hold table
+
+    Input:
+        spec: dict(str: str)
+
+    Output:
+        marker: str
+    """
+    if 'id' in spec:
+        return f'id="{spec["id"]}"'
+
+    return spec['class']
+
+
+def element_tag(spec):
+    """
+    Function:
+        Tag of element, table unless spec names one
+
+    Input:
+        spec: dict(str: str)
+
+    Output:
+        tag: str
+    """
+    return spec.get('tag', 'table')
+
+
+def matches(table, spec):
+    """
+    Function:
+        Whether table element matches spec
+
+    Input:
+        table: element
+        spec: dict(str: str)
+
+    Output:
+        match: bool
+    """
+    if table.tag != element_tag(spec):
+        return False
+
+    if 'id' in spec:
+        return table.get('id') == spec['id']
+
+    return spec['class'] in table.get('class', '').split()
+
+
+def find_tables(html, names=BOXSCORE_TABLES):
+    """
+    Function:
+        Index tables of page in one pass. Tables hidden in HTML comments
+        are parsed only when the comment holds a wanted table, and the
+        scan stops once every table is found.
+
+    Input:
+        html: bytes
+        names: list(str)
+
+    Output:
+        tables: dict(str: element)
+    """
+    root = parse_html(html)
+    wanted = {name: BOXSCORE_TABLES[name] for name in names}
+    tags = {element_tag(spec) for spec in wanted.values()}
+    tables = {}
+
+    for node in root.iter(*tags, etree.Comment):
+        if node.tag is etree.Comment:
+            # Skip comments without a wanted table
+            names_in_comment = [name for name in wanted if marker(wanted[name]) in (node.text or '')]
+            if not names_in_comment:
+                continue
+
+            comment_root = lxml.html.fromstring(node.text)
+            for name in names_in_comment:
+                for table in comment_root.iter(element_tag(wanted[name])):
+                    if matches(table, wanted[name]):
+                        tables[name] = table
+                        del wanted[name]
+                        break
+
+        else:
+            for name, spec in wanted.items():
+                if matches(node, spec):
+                    tables[name] = node
+                    del wanted[name]
+                    break
+
+        if not wanted:
+            break
+
+    return tables
+
+
+def cell_text(cell):
+    """
+    Function:
+        Text of cell and its descendants
+
+    Input:
+        cell: element
+
+    Output:
+        text: str
+    """
+    # Plain cells skip the subtree walk
+    if len(cell) == 0:
+        return cell.text or ''
+
+    return str(cell.text_content())
+
+
+def header_labels(table):
+    """
+    Function:
+        data-stat labels of the last header row
+
+    Input:
+        table: element
+
+    Output:
+        labels: list(str)
+    """
+    return [th.get('data-stat') for th in table.find('thead').findall('.//tr')[-1].iter('th')]
+
+
+def body_rows(table):
+    """
+    Function:
+        Rows of table body
+
+    Input:
+        table: element
+
+    Output:
+        rows: list(element)
+    """
+    return table.find('tbody').findall('.//tr')
+
+
+def read_rows(table, keep_classed=False, tip_stats=()):
+    """
+    Function:
+        Read body rows of table straight into column arrays keyed by
+        data-stat. Rows with a class (repeated headers, team breaks)
+        are dropped unless keep_classed. Repeated header rows, classed
+        thead, are always dropped.
+
+    Input:
+        table: element
+        keep_classed: bool
+        tip_stats: list(str)
+
+    Output:
+        columns: dict(str: list(str))
+        sections: list(int), classed rows seen before each kept row
+        tips: dict(str: list(str)), tip of the span in each tip_stats cell
+    """
+    columns = {}
+    sections = []
+    tips = {stat: [] for stat in tip_stats}
+
+    section = 0
+    for tr in body_rows(table):
+        classes = tr.get('class')
+        if classes is not None:
+            section += 1
+            if not keep_classed or 'thead' in classes.split():
+                continue
+
+        sections.append(section)
+        for cell in tr.iterchildren('th', 'td'):
+            stat = cell.get('data-stat')
+            if stat in columns:
+                columns[stat].append(cell_text(cell))
+            else:
+                columns[stat] = [cell_text(cell)]
+            if stat in tips:
+                tips[stat].append(cell.find('span').get('tip'))
+
+    return columns, sections, tips
@@ -0,0 +1,47 @@
+import os
+import sys
+import pytest
+
+# Modules import as backend.*, from src/ like the scrapers are run
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from backend.benchmarks import mock_server
+from backend.scraping import fetch
+
+
+@pytest.fixture
+def site():
+    """
+    Function:
+        Mock site served by a local http.server for the test
+
+    Input:
+        None
+
+    Output:
+        server: ThreadingHTTPServer, with the MockSite as server.site
+        base_url: str
+    """
+    server, base_url = mock_server.start()
+    yield server, base_url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """
+    Function:
+        Empty page cache of the test, restoring the fetch settings after
+
+    Input:
+        tmp_path: Path
+
+    Output:
+        cache_dir: str
+    """
+    settings = fetch.CACHE_DIR, fetch.OFFLINE, fetch.RETRIES, fetch.BACKOFF
+    fetch.configure(cache_dir=str(tmp_path / 'html'), offline=False)
+    yield str(tmp_path / 'html')
+    fetch.CACHE_DIR, fetch.OFFLINE, fetch.RETRIES, fetch.BACKOFF = settings
+    fetch.POOL.close()
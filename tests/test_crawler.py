@@ -0,0 +1,103 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+from backend.benchmarks import mock_server
+from backend.scraping import fetch
+from backend.scraping.crawler import Crawler, retry_dead_letters
+from backend.scraping.dead_letters import DeadLetters
+
+
+async def get_all(crawler, urls):
+    try:
+        return await asyncio.gather(*(crawler.get(url) for url in urls))
+    finally:
+        crawler.close()
+
+
+def test_crawler_gets_pages(site, cache):
+    server, base_url = site
+    urls = [f'{base_url}/years/2020/'] + [f'{base_url}/years/2020/week_{week}.htm' for week in range(1, 6)]
+    crawler = Crawler(rates={urlsplit(base_url).netloc: (100, 10)})
+
+    pages = asyncio.run(get_all(crawler, urls))
+
+    assert pages[0] == mock_server.season_page(2020)
+    assert pages[1:] == [mock_server.week_page(2020, week) for week in range(1, 6)]
+    assert server.site.stats()['statuses'] == {200: len(urls)}
+
+    # Second crawl is served from the cache
+    pages = asyncio.run(get_all(Crawler(rates={urlsplit(base_url).netloc: (100, 10)}), urls))
+    assert pages[0] == mock_server.season_page(2020)
+    assert server.site.stats()['statuses'] == {200: len(urls)}
+
+
+def test_crawler_rate_limits_each_host(site, cache):
+    server, base_url = site
+    port = urlsplit(base_url).port
+    hosts = [f'127.0.0.1:{port}', f'localhost:{port}']
+    urls = [f'http://{host}/years/2020/week_{week}.htm' for host in hosts for week in range(1, 5)]
+
+    # 4 requests per host at 4 per second with a burst of 1 take at least 0.75s
+    crawler = Crawler(rates={host: (4, 1) for host in hosts})
+    start = time.monotonic()
+    pages = asyncio.run(get_all(crawler, urls))
+    elapsed = time.monotonic() - start
+
+    assert pages == [mock_server.week_page(2020, week) for _ in hosts for week in range(1, 5)]
+    assert elapsed >= 0.75
+
+    # Hosts have buckets of their own, so both are crawled in about the time of one
+    assert elapsed < 1.5
+    assert set(crawler.buckets) == set(hosts)
+
+
+def test_crawler_retries_through_the_bucket(site, cache):
+    server, base_url = site
+    server.site.error_rate = 0.5
+    fetch.configure(retries=20, backoff=0.01)
+    urls = [f'{base_url}/years/2020/week_{week}.htm' for week in range(1, 5)]
+
+    # Every attempt, retries included, spends a token at 10 per second
+    crawler = Crawler(rates={urlsplit(base_url).netloc: (10, 1)})
+    start = time.monotonic()
+    pages = asyncio.run(get_all(crawler, urls))
+    elapsed = time.monotonic() - start
+
+    statuses = server.site.stats()['statuses']
+    assert pages == [mock_server.week_page(2020, week) for week in range(1, 5)]
+    assert statuses[200] == len(urls) and statuses.get(503, 0) > 0
+    assert elapsed >= (sum(statuses.values()) - 1) / 10
+
+
+def test_dead_letters_retry_through_the_crawler(site, cache, tmp_path, monkeypatch):
+    server, base_url = site
+    monkeypatch.setattr('backend.scraping.crawler.BASE_URL', base_url)
+    fetch.configure(retries=0)
+    dead_letters = DeadLetters('test', str(tmp_path))
+    games = [
+        {'href': href, 'away': 'Away', 'home': 'Home', 'date': 'Sep 13, 2020'}
+        for href in ['/boxscores/202009130den.htm', '/boxscores/missing']
+    ]
+    for game_info in games:
+        dead_letters.add(game_info, OSError('dropped'))
+
+    parsed = []
+    crawler = Crawler(rates={urlsplit(base_url).netloc: (100, 10)})
+
+    def parse_game(html, game_info, sink):
+        parsed.append(game_info['href'])
+
+    async def retry():
+        try:
+            return await retry_dead_letters(crawler, dead_letters, parse_game, None)
+        finally:
+            crawler.close()
+
+    game_filter = asyncio.run(retry())
+
+    # Fetched with the crawl's own bucket, the recovered game is not crawled again
+    assert parsed == ['/boxscores/202009130den.htm']
+    assert set(crawler.buckets) == {urlsplit(base_url).netloc}
+    assert not game_filter(games[0]) and game_filter(games[1])
+    assert list(dead_letters.entries) == ['/boxscores/missing']
+    assert dead_letters.entries['/boxscores/missing']['attempts'] == 2
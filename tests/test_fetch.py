@@ -0,0 +1,42 @@
+import os
+import time
+from backend.benchmarks import mock_server
+from backend.scraping import fetch
+from backend.scraping.connections import ConnectionPool
+
+
+def test_pool_reuses_one_connection(site):
+    server, base_url = site
+    clients = set()
+    respond = server.site.respond
+
+    def record(handler):
+        clients.add(handler.client_address)
+        respond(handler)
+
+    server.site.respond = record
+    pool = ConnectionPool()
+    try:
+        for week in range(1, 11):
+            status, html, _ = pool.request(f'{base_url}/years/2020/week_{week}.htm')
+            assert (status, html) == (200, mock_server.week_page(2020, week))
+    finally:
+        pool.close()
+
+    assert pool.opened == 1
+    assert len(clients) == 1
+
+
+def test_unchanged_page_is_revalidated(site, cache):
+    server, base_url = site
+    url = f'{base_url}/years/2020/week_1.htm'
+
+    assert fetch.fetch(url) == mock_server.week_page(2020, 1)
+
+    # Age the cached copy past its TTL, the server still has the same page
+    path = fetch.cache_path(url)
+    os.utime(path, (time.time() - 60, time.time() - 60))
+    assert fetch.fetch(url, ttls={'week': 30}) == mock_server.week_page(2020, 1)
+
+    assert server.site.stats()['statuses'] == {200: 1, 304: 1}
+    assert time.time() - os.path.getmtime(path) < 30
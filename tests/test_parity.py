@@ -0,0 +1,17 @@
+import pytest
+from backend.benchmarks.parity import read_expected, scrape_fixtures
+from backend.scraping.weekly_stats import TABLES
+
+
+@pytest.fixture(scope='module', params=[False, True], ids=['untyped', 'typed'])
+def csvs(request):
+    return scrape_fixtures(typed=request.param)
+
+
+def test_every_table_is_scraped(csvs):
+    assert sorted(csvs) == sorted(TABLES)
+
+
+@pytest.mark.parametrize('table', TABLES)
+def test_table_matches_expected(csvs, table):
+    assert csvs[table] == read_expected(table)
@@ -0,0 +1,42 @@
+import pandas as pd
+from backend.scraping import store
+
+
+def scores(week, overtime):
+    df = pd.DataFrame({
+        'date': ['Sep 12, 2021', 'Sep 12, 2021'],
+        'week': [week, week],
+        'season': [2021, 2021],
+        'team': ['Dallas Cowboys', 'Tampa Bay Buccaneers'],
+        'opponent': ['Tampa Bay Buccaneers', 'Dallas Cowboys'],
+        'home_field': [False, True],
+        'Final': [31, 28]
+    })
+    if overtime:
+        df['OT'] = [3, 0]
+
+    return df
+
+
+def test_read_columns_missing_from_a_segment(tmp_path):
+    store_dir = str(tmp_path)
+    store.write_table('scores', scores(1, overtime=True), store_dir)
+    store.append_table('scores', scores(2, overtime=False), store_dir)
+    store.append_table('scores', scores(1, overtime=False), store_dir)
+
+    df = store.read_table('scores', columns=['season', 'week', 'OT'], store_dir=store_dir)
+
+    assert list(df.columns) == ['season', 'week', 'OT']
+    assert df['week'].tolist() == [1, 1, 1, 1, 2, 2]
+    assert df['OT'].tolist()[:2] == [3, 0]
+    assert df['OT'].isna().tolist() == [False, False, True, True, True, True]
+    assert str(df['OT'].dtype) == 'Int16'
+
+
+def test_read_columns_of_no_segment(tmp_path):
+    store_dir = str(tmp_path)
+    store.write_table('scores', scores(1, overtime=False), store_dir)
+
+    df = store.read_table('scores', columns=['week', 'OT'], store_dir=store_dir)
+
+    assert df['OT'].isna().all() and str(df['OT'].dtype) == 'Int16'